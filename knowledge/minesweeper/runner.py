@@ -1,6 +1,8 @@
 import pygame
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from minesweeper import Minesweeper, MinesweeperAI
 
@@ -13,16 +15,26 @@ BLACK = (0, 0, 0)
 GRAY = (180, 180, 180)
 WHITE = (255, 255, 255)
 
-# Create game
-pygame.init()
+# Create game, starting only the pygame modules the runner uses
+pygame.display.init()
+pygame.font.init()
 size = width, height = 600, 400
 screen = pygame.display.set_mode(size)
 
 # Fonts
 OPEN_SANS = "assets/fonts/OpenSans-Regular.ttf"
-smallFont = pygame.font.Font(OPEN_SANS, 20)
-mediumFont = pygame.font.Font(OPEN_SANS, 28)
-largeFont = pygame.font.Font(OPEN_SANS, 40)
+SMALL = 20
+MEDIUM = 28
+LARGE = 40
+
+
+@lru_cache(maxsize=None)
+def font(size):
+    """
+    Loads the font at a size the first time it is drawn with.
+    """
+    return pygame.font.Font(OPEN_SANS, size)
+
 
 # Compute board size
 BOARD_PADDING = 20
@@ -31,11 +43,15 @@ board_height = height - (BOARD_PADDING * 2)
 cell_size = int(min(board_width / WIDTH, board_height / HEIGHT))
 board_origin = (BOARD_PADDING, BOARD_PADDING)
 
-# Add images
-flag = pygame.image.load("assets/images/flag.png")
-flag = pygame.transform.scale(flag, (cell_size, cell_size))
-mine = pygame.image.load("assets/images/mine.png")
-mine = pygame.transform.scale(mine, (cell_size, cell_size))
+
+@lru_cache(maxsize=None)
+def image(name):
+    """
+    Decodes and scales an image the first time it is drawn.
+    """
+    surface = pygame.image.load(f"assets/images/{name}.png")
+    return pygame.transform.scale(surface, (cell_size, cell_size))
+
 
 # Create game and AI agent
 game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
@@ -49,7 +65,46 @@ lost = False
 # Show instructions initially
 instructions = True
 
+# AI work runs on one background thread, so calls on the AI stay in order
+# while the window keeps redrawing; results are polled every frame
+ai_worker = ThreadPoolExecutor(max_workers=1)
+ai_future = None
+knowledge_future = None
+think_time = None
+frame_time = 0
+clock = pygame.time.Clock()
+
+
+def choose_move(ai):
+    """
+    Picks the AI's next move on the worker thread.
+    Returns (move, known mines, message, seconds taken).
+    """
+    start = time.perf_counter()
+    move = ai.make_safe_move()
+    if move is None:
+        move = ai.make_random_move()
+        if move is None:
+            message = "No moves left to make."
+        else:
+            message = "No known safe moves, AI making random move."
+    else:
+        message = "AI making safe move."
+    return move, ai.mines.copy(), message, time.perf_counter() - start
+
+
+def learn(ai, move, nearby):
+    """
+    Adds knowledge on the worker thread, returning the seconds taken.
+    """
+    start = time.perf_counter()
+    ai.add_knowledge(move, nearby)
+    return time.perf_counter() - start
+
+
 while True:
+    # Smoothed frame time in milliseconds
+    frame_time = 0.9 * frame_time + 0.1 * clock.tick(60)
 
     # Check if game quit
     for event in pygame.event.get():
@@ -62,7 +117,7 @@ while True:
     if instructions:
 
         # Title
-        title = largeFont.render("Play Minesweeper", True, WHITE)
+        title = font(LARGE).render("Play Minesweeper", True, WHITE)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 50)
         screen.blit(title, titleRect)
@@ -74,14 +129,14 @@ while True:
             "Mark all mines successfully to win!"
         ]
         for i, rule in enumerate(rules):
-            line = smallFont.render(rule, True, WHITE)
+            line = font(SMALL).render(rule, True, WHITE)
             lineRect = line.get_rect()
             lineRect.center = ((width / 2), 150 + 30 * i)
             screen.blit(line, lineRect)
 
         # Play game button
         buttonRect = pygame.Rect((width / 4), (3 / 4) * height, width / 2, 50)
-        buttonText = mediumFont.render("Play Game", True, BLACK)
+        buttonText = font(MEDIUM).render("Play Game", True, BLACK)
         buttonTextRect = buttonText.get_rect()
         buttonTextRect.center = buttonRect.center
         pygame.draw.rect(screen, WHITE, buttonRect)
@@ -115,11 +170,11 @@ while True:
 
             # Add a mine, flag, or number if needed
             if game.is_mine((i, j)) and lost:
-                screen.blit(mine, rect)
+                screen.blit(image("mine"), rect)
             elif (i, j) in flags:
-                screen.blit(flag, rect)
+                screen.blit(image("flag"), rect)
             elif (i, j) in revealed:
-                neighbors = smallFont.render(
+                neighbors = font(SMALL).render(
                     str(game.nearby_mines((i, j))),
                     True, BLACK
                 )
@@ -135,7 +190,7 @@ while True:
         (2 / 3) * width + BOARD_PADDING, (1 / 3) * height - 50,
         (width / 3) - BOARD_PADDING * 2, 50
     )
-    buttonText = mediumFont.render("AI Move", True, BLACK)
+    buttonText = font(MEDIUM).render("AI Move", True, BLACK)
     buttonRect = buttonText.get_rect()
     buttonRect.center = aiButton.center
     pygame.draw.rect(screen, WHITE, aiButton)
@@ -146,7 +201,7 @@ while True:
         (2 / 3) * width + BOARD_PADDING, (1 / 3) * height + 20,
         (width / 3) - BOARD_PADDING * 2, 50
     )
-    buttonText = mediumFont.render("Reset", True, BLACK)
+    buttonText = font(MEDIUM).render("Reset", True, BLACK)
     buttonRect = buttonText.get_rect()
     buttonRect.center = resetButton.center
     pygame.draw.rect(screen, WHITE, resetButton)
@@ -154,7 +209,9 @@ while True:
 
     # Display text
     text = "Lost" if lost else "Won" if game.mines == flags else ""
-    text = mediumFont.render(text, True, WHITE)
+    if not text and ai_future is not None:
+        text = "Thinking..."
+    text = font(MEDIUM).render(text, True, WHITE)
     textRect = text.get_rect()
     textRect.center = ((5 / 6) * width, (2 / 3) * height)
     screen.blit(text, textRect)
@@ -178,22 +235,21 @@ while True:
     elif left == 1:
         mouse = pygame.mouse.get_pos()
 
-        # If AI button clicked, make an AI move
+        # If AI button clicked, start computing an AI move
         if aiButton.collidepoint(mouse) and not lost:
-            move = ai.make_safe_move()
-            if move is None:
-                move = ai.make_random_move()
-                if move is None:
-                    flags = ai.mines.copy()
-                    print("No moves left to make.")
-                else:
-                    print("No known safe moves, AI making random move.")
-            else:
-                print("AI making safe move.")
+            if ai_future is None:
+                ai_future = ai_worker.submit(choose_move, ai)
             time.sleep(0.2)
 
         # Reset game state
         elif resetButton.collidepoint(mouse):
+            # Cancel queued AI work; anything already running finishes on
+            # the old AI object and its result is ignored
+            for future in (ai_future, knowledge_future):
+                if future is not None:
+                    future.cancel()
+            ai_future = None
+            knowledge_future = None
             game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
             ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
             revealed = set()
@@ -210,6 +266,25 @@ while True:
                             and (i, j) not in revealed):
                         move = (i, j)
 
+    # Check for a finished AI move
+    if ai_future is not None and ai_future.done():
+        ai_move, known_mines, message, think_time = ai_future.result()
+        ai_future = None
+        # The board may have changed while the AI was thinking: drop its
+        # move after a loss, onto a cell the user has since revealed, or
+        # when the user clicked a cell this frame
+        if lost or ai_move in revealed or move is not None:
+            print("AI move discarded: the board changed while thinking.")
+        elif ai_move is None:
+            flags = known_mines
+            print(message)
+        else:
+            move = ai_move
+            print(message)
+    if knowledge_future is not None and knowledge_future.done():
+        think_time = knowledge_future.result()
+        knowledge_future = None
+
     # Make move and update AI knowledge
     if move:
         if game.is_mine(move):
@@ -217,6 +292,15 @@ while True:
         else:
             nearby = game.nearby_mines(move)
             revealed.add(move)
-            ai.add_knowledge(move, nearby)
+            knowledge_future = ai_worker.submit(learn, ai, move, nearby)
+
+    # Show frame and AI think time
+    metrics = f"Frame: {frame_time:.1f} ms"
+    if think_time is not None:
+        metrics += f"   AI: {think_time * 1000:.1f} ms"
+    metrics = font(SMALL).render(metrics, True, WHITE)
+    metricsRect = metrics.get_rect()
+    metricsRect.bottomright = (width - 10, height - 5)
+    screen.blit(metrics, metricsRect)
 
     pygame.display.flip()
@@ -0,0 +1,229 @@
+"""
+Network-wide statistics of the co-star graph.
+
+Usage: python analytics.py directory [samples] [report.json]
+
+Computes connected components with union-find over each movie's cast,
+degree histograms, and sampling-based estimates of the average degree
+of separation and of eccentricities from one breadth-first search per
+sampled person. A multi-source breadth-first search from all samples
+at once finds the person farthest from them, whose eccentricity
+tightens the diameter bound. The statistics are written as a JSON
+report (to stdout if no file is given).
+"""
+
+import json
+import random
+import sys
+import time
+
+import degrees
+
+
+def people_and_casts():
+    """
+    Returns the list of person keys and an iterable of movie casts
+    (lists of person keys) for whichever backend degrees has loaded.
+    Keys are integer indices for the compact graph, person_ids otherwise.
+    """
+    graph = degrees.graph
+    if graph is not None:
+        casts = (graph.stars_of(movie) for movie in range(len(graph.movie_ids)))
+        return list(range(len(graph.person_ids))), casts
+    casts = (movie["stars"] for movie in degrees.movies.values())
+    return list(degrees.people), casts
+
+
+def co_stars(person):
+    """
+    Returns the set of people who starred with `person` (a key as
+    returned by `people_and_casts`), excluding `person`.
+    """
+    graph = degrees.graph
+    if graph is not None:
+        neighbors = set(graph.movie_people[j]
+                        for movie in graph.movies_of(person)
+                        for j in range(graph.movie_offsets[movie],
+                                       graph.movie_offsets[movie + 1]))
+    else:
+        neighbors = set(person_id for _, person_id
+                        in degrees.neighbors_for_person(person))
+    neighbors.discard(person)
+    return neighbors
+
+
+class UnionFind():
+    """
+    Disjoint sets over arbitrary hashable items, with path halving and
+    union by size.
+    """
+
+    def __init__(self, items):
+        self.parent = {item: item for item in items}
+        self.size = {item: 1 for item in items}
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size.pop(b)
+
+
+def components():
+    """
+    Returns a dict mapping each component's root to the list of its
+    people.
+    """
+    persons, casts = people_and_casts()
+    sets = UnionFind(persons)
+    for cast in casts:
+        cast = list(cast)
+        for person in cast[1:]:
+            sets.union(cast[0], person)
+
+    groups = {}
+    for person in persons:
+        groups.setdefault(sets.find(person), []).append(person)
+    return groups
+
+
+def histogram(values):
+    """
+    Returns a {value: count} dict with keys in increasing order.
+    """
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def layer_sizes(sources):
+    """
+    Breadth-first search from all of `sources` at once. Returns the
+    number of people first reached at each distance (index 0 holds the
+    sources themselves) and the people of the last layer, the ones
+    farthest from every source.
+    """
+    seen = set(sources)
+    frontier = list(seen)
+    sizes = []
+    while frontier:
+        sizes.append(len(frontier))
+        next_frontier = []
+        for person in frontier:
+            for neighbor in co_stars(person):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+        if not next_frontier:
+            return sizes, frontier
+        frontier = next_frontier
+    return sizes, []
+
+
+def separation_estimates(component, samples, rng):
+    """
+    Estimates separation statistics of `component` from up to `samples`
+    random people in it.
+
+    A single-source BFS from each sample gives the separation histogram
+    and the sampled eccentricities. One multi-source BFS from all the
+    samples then finds the person farthest from any of them (the
+    coverage radius), and a last BFS from that person raises the lower
+    bound on the diameter, much like a double sweep. The upper bound is
+    twice the smallest sampled eccentricity.
+    """
+    sources = rng.sample(component, min(samples, len(component)))
+    distance_counts = {}
+    eccentricities = []
+    for source in sources:
+        sizes, _ = layer_sizes([source])
+        eccentricities.append(len(sizes) - 1)
+        for distance, size in enumerate(sizes[1:], 1):
+            distance_counts[distance] = distance_counts.get(distance, 0) + size
+
+    radius = 0
+    lower_bound = max(eccentricities, default=0)
+    if sources:
+        sizes, farthest = layer_sizes(sources)
+        radius = len(sizes) - 1
+        sweep_sizes, _ = layer_sizes([farthest[0]])
+        lower_bound = max(lower_bound, len(sweep_sizes) - 1)
+
+    pairs = sum(distance_counts.values())
+    return {
+        "sampled_sources": len(sources),
+        "average_separation": (
+            sum(d * count for d, count in distance_counts.items()) / pairs
+            if pairs else 0
+        ),
+        "separation_histogram": dict(sorted(distance_counts.items())),
+        "eccentricity_histogram": histogram(eccentricities),
+        "coverage_radius": radius,
+        "diameter_lower_bound": lower_bound,
+        "diameter_upper_bound": 2 * min(eccentricities, default=0),
+    }
+
+
+def report(samples=100, seed=0):
+    """
+    Computes every statistic and returns them as a JSON-ready dict.
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+
+    groups = sorted(components().values(), key=len, reverse=True)
+    largest = groups[0] if groups else []
+    persons, _ = people_and_casts()
+
+    result = {
+        "people": len(persons),
+        "movies": len(degrees.movies),
+        "components": len(groups),
+        "largest_component": len(largest),
+        "isolated_people": sum(1 for group in groups if len(group) == 1),
+        "component_size_histogram": histogram(len(group) for group in groups),
+        "co_star_degree_histogram": histogram(
+            len(co_stars(person)) for person in persons
+        ),
+        "film_count_histogram": histogram(
+            degrees.film_count(person_id) for person_id in degrees.people
+        ),
+        "largest_component_separation": separation_estimates(largest, samples, rng),
+    }
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4]:
+        sys.exit("Usage: python analytics.py directory [samples] [report.json]")
+    directory = sys.argv[1]
+    samples = int(sys.argv[2]) if len(sys.argv) >= 3 else 100
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory, compact=True)
+    print("Data loaded.", file=sys.stderr)
+
+    stats = report(samples)
+    if len(sys.argv) == 4:
+        with open(sys.argv[3], "w") as f:
+            json.dump(stats, f, indent=2)
+    else:
+        json.dump(stats, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Batch degrees-of-separation queries.
+
+Queries are grouped by source so a single breadth-first search tree is
+built per distinct source and reused for all of its targets. Results
+are streamed out one source group at a time.
+
+Usage: python batch.py directory pairs.csv [processes]
+
+`pairs.csv` holds one `source,target` pair of person ids per line. The
+output is CSV with the source, target, number of degrees (empty when
+not connected) and the path as `movie_id:person_id` steps.
+"""
+
+import csv
+import multiprocessing
+import sys
+
+import degrees
+
+
+def read_pairs(filename):
+    """
+    Yields (source, target) person id pairs from a CSV file, skipping
+    blank lines and an optional `source,target` header.
+    """
+    with open(filename, encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or row[:2] == ["source", "target"]:
+                continue
+            yield row[0].strip(), row[1].strip()
+
+
+def group_by_source(pairs):
+    """
+    Returns a dict mapping each source to its list of targets, in the
+    order the sources first appear.
+    """
+    groups = {}
+    for source, target in pairs:
+        groups.setdefault(source, []).append(target)
+    return groups
+
+
+def solve_group(group):
+    """
+    Answers every query of one source from a single BFS tree.
+
+    Returns a list of (source, target, path) tuples, where path is as
+    returned by `degrees.shortest_path`.
+    """
+    source, targets = group
+    if source not in degrees.people:
+        return [(source, target, None) for target in targets]
+
+    tree = degrees.bfs_tree(source)
+    results = []
+    for target in targets:
+        if target not in degrees.people:
+            results.append((source, target, None))
+        else:
+            results.append((source, target, degrees.path_from_tree(tree, target)))
+    return results
+
+
+def batch_shortest_paths(pairs, processes=None):
+    """
+    Yields (source, target, path) for every (source, target) pair.
+
+    Results come out grouped by source. With `processes`, source groups
+    are spread over a pool of forked workers, which share the already
+    loaded dataset copy-on-write; groups are then yielded in completion
+    order rather than input order.
+    """
+    groups = group_by_source(pairs)
+
+    if not processes or processes == 1:
+        for group in groups.items():
+            yield from solve_group(group)
+        return
+
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        for results in pool.imap_unordered(solve_group, groups.items()):
+            yield from results
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python batch.py directory pairs.csv [processes]")
+    directory = sys.argv[1]
+    processes = int(sys.argv[3]) if len(sys.argv) == 4 else None
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory, compact=True)
+    print("Data loaded.", file=sys.stderr)
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["source", "target", "degrees", "path"])
+    pairs = read_pairs(sys.argv[2])
+    for source, target, path in batch_shortest_paths(pairs, processes):
+        if path is None:
+            writer.writerow([source, target, "", ""])
+        else:
+            steps = " ".join(f"{movie_id}:{person_id}" for movie_id, person_id in path)
+            writer.writerow([source, target, len(path), steps])
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
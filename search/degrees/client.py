@@ -0,0 +1,64 @@
+"""
+Command-line client for server.py.
+
+Usage:
+    python client.py path <source_id> <target_id> [port]
+    python client.py names <name> [port]
+    python client.py stats [port]
+"""
+
+import http.client
+import json
+import sys
+from urllib.parse import urlencode
+
+from server import DEFAULT_PORT
+
+
+class Client():
+    """
+    Keeps one HTTP connection to a local degrees server open.
+    """
+
+    def __init__(self, port=DEFAULT_PORT, host="127.0.0.1"):
+        self.connection = http.client.HTTPConnection(host, port)
+
+    def get(self, path, **params):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        self.connection.request("GET", path)
+        response = self.connection.getresponse()
+        return json.loads(response.read())
+
+    def path(self, source, target):
+        return self.get("/path", source=source, target=target)
+
+    def names(self, query, limit=10):
+        return self.get("/names", q=query, limit=limit)
+
+    def stats(self):
+        return self.get("/stats")
+
+    def close(self):
+        self.connection.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["path"] and len(args) in [3, 4]:
+        client = Client(*map(int, args[3:]))
+        result = client.path(args[1], args[2])
+    elif args[:1] == ["names"] and len(args) in [2, 3]:
+        client = Client(*map(int, args[2:]))
+        result = client.names(args[1])
+    elif args[:1] == ["stats"] and len(args) in [1, 2]:
+        client = Client(*map(int, args[1:]))
+        result = client.stats()
+    else:
+        sys.exit(__doc__.strip())
+    print(json.dumps(result, indent=2))
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
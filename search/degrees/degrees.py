@@ -1,21 +1,76 @@
 import csv
+import os
 import sys
+import tracemalloc
+from array import array
 
-from util import Node, StackFrontier, QueueFrontier
+import ingest
+import snapshot
+from cache import LRUCache
+from graph import CompactGraph
+from nameindex import NameIndex
+from records import RecordTable
 
-# Maps names to a set of corresponding person_ids
-names = {}
-
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
+# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids).
+# A RecordTable of just name and birth when compact.
 people = {}
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
+# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids).
+# A RecordTable of just title and year when compact.
 movies = {}
 
+# Compact integer-indexed graph, set when loading with compact=True
+graph = None
+
+# Sorted name index over `people`, built (or mapped from a snapshot) by load_data
+name_index = None
+
+# Caches for cached_shortest_path, cleared whenever data is (re)loaded.
+# Paths are keyed on the unordered (source, target) pair, trees on source.
+# Trees only enter the cache through `cache_tree`, never in the middle of
+# a query; with the compact graph each costs 16 bytes per person.
+path_cache = LRUCache(maxsize=4096)
+tree_cache = LRUCache(maxsize=8)
+
 
-def load_data(directory):
+def load_data(directory, compact=False, use_snapshot=True, processes=None):
     """
     Load data from CSV files into memory.
+
+    With `compact`, star credits go into a CompactGraph, and `people` and
+    `movies` become RecordTables over the graph's interned ids instead
+    of dictionaries.
+
+    If the directory holds an up-to-date snapshot (see snapshot.py),
+    it is memory-mapped instead of parsing the CSVs, which always
+    gives the compact representation; the name index is mapped from it
+    too rather than rebuilt.
+
+    `processes` sets how many worker processes parse stars.csv for the
+    compact graph; progress is then reported on stderr.
+    """
+    global graph, name_index, people, movies
+    clear_caches()
+    if use_snapshot and snapshot.is_fresh(directory):
+        graph, people, movies, name_index = snapshot.load_snapshot(directory)
+    elif compact:
+        graph = CompactGraph()
+        people = RecordTable(graph.person_ids, graph.person_index, ("name", "birth"))
+        movies = RecordTable(graph.movie_ids, graph.movie_index, ("title", "year"))
+        load_compact(directory, processes)
+        name_index = NameIndex.build(people)
+    else:
+        graph = None
+        people = {}
+        movies = {}
+        load_csv(directory)
+        name_index = NameIndex.build(people)
+
+
+def load_csv(directory):
+    """
+    Load data from CSV files into the `people` and `movies`
+    dictionaries, with star credits as sets on both sides.
     """
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
@@ -26,10 +81,6 @@ def load_data(directory):
                 "birth": row["birth"],
                 "movies": set()
             }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
 
     # Load movies
     with open(f"{directory}/movies.csv", encoding="utf-8") as f:
@@ -52,14 +103,53 @@ def load_data(directory):
                 pass
 
 
+def load_compact(directory, processes=None):
+    """
+    Load data from CSV files into `graph`, with names, births, titles
+    and years appended to the `people` and `movies` RecordTables.
+    """
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row["id"] in graph.person_index:
+                continue
+            graph.add_person(row["id"])
+            people.append(row["name"], row["birth"])
+
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row["id"] in graph.movie_index:
+                continue
+            graph.add_movie(row["id"])
+            movies.append(row["title"], row["year"])
+
+    person_column, movie_column = ingest.read_star_columns(
+        f"{directory}/stars.csv", graph.person_index, graph.movie_index,
+        processes=processes, progress=processes is not None
+    )
+    graph.build(person_column, movie_column)
+
+
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    compact = "--compact" in args
+    if compact:
+        args.remove("--compact")
+    measure_memory = "--memory" in args
+    if measure_memory:
+        args.remove("--memory")
+    parallel = "--parallel" in args
+    if parallel:
+        args.remove("--parallel")
+    if len(args) > 1:
+        sys.exit("Usage: python degrees.py [--compact] [--parallel] [--memory] [directory]")
+    directory = args[0] if len(args) == 1 else "large"
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(directory, compact=compact or parallel,
+              processes=os.cpu_count() if parallel else None)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +159,13 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
+    if measure_memory:
+        tracemalloc.start()
     path = shortest_path(source, target)
+    if measure_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Peak search memory: {peak / 1024:.1f} KiB")
 
     if path is None:
         print("Not connected.")
@@ -90,55 +186,339 @@ def shortest_path(source, target):
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    Runs a bidirectional breadth-first search: one frontier grows from
+    the source and one from the target, always expanding the smaller of
+    the two one full layer at a time, and the search stops as soon as a
+    generated person has already been reached from the other side.
     """
-    def is_goal_state(state):
-        return state == target
-    #print(source)
-    source_node = Node(state=source, parent=None, action=None)
-    #print(source_node.state)
-    frontier = QueueFrontier() #for BFS -> Use queue structure
-    frontier.add(source_node)
-    explored = []
-
-    while True:
-        #1. If the frontier is empty -> stop, theres no solution
-        if frontier.empty():
+    if source == target:
+        return []
+
+    if graph is not None:
+        path = compact_search(
+            graph.person_index[source], graph.person_index[target]
+        )
+        if path is None:
             return None
-        #2. Remove a node from the frontier. This is the node that will be considered
-        considered_node = frontier.remove()
-        #print(considered_node.state)
-        #3. if the node contains the goal state -> return the solution. STOP
-        if is_goal_state(considered_node.state):
-            solution = []
-            solution.append((considered_node.action, considered_node.state))
-            while not considered_node.parent == source_node:
-                node_to_be_added = considered_node.parent
-                solution.append((node_to_be_added.action, node_to_be_added.state))
-                considered_node = considered_node.parent
-            solution.reverse()
-            print(solution)
-            return solution
-
-        # else: * Expand the node (find all the new nodes that could be reached from this node), 
-        # and add resulting nodes to the frontier.
-        #* Add the current node to the explored set.
+        return [
+            (graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in path
+        ]
+
+    return bidirectional_search(source, target, neighbors_for_person)
+
+
+def compact_search(source, target):
+    """
+    Bidirectional search over the compact graph between two person
+    indices, returning a list of (movie, person) index pairs or None.
+
+    Parent pointers and the movie linking each person to its parent live
+    in the graph's dense search arrays, so no per-edge Python objects
+    are allocated; the slots touched are reset before returning.
+    """
+    forward_parent, forward_movie, backward_parent, backward_movie = (
+        graph.search_arrays()
+    )
+    forward_parent[source] = source
+    backward_parent[target] = target
+    touched = [source, target]
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    try:
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = expand_compact_layer(
+                    forward_frontier, forward_parent, forward_movie,
+                    backward_parent, touched
+                )
+            else:
+                backward_frontier, meeting = expand_compact_layer(
+                    backward_frontier, backward_parent, backward_movie,
+                    forward_parent, touched
+                )
+            if meeting is None:
+                continue
+
+            path = []
+            person = meeting
+            while person != source:
+                path.append((forward_movie[person], person))
+                person = forward_parent[person]
+            path.reverse()
+            person = meeting
+            while person != target:
+                path.append((backward_movie[person], backward_parent[person]))
+                person = backward_parent[person]
+            return path
+
+        return None
+    finally:
+        for person in touched:
+            forward_parent[person] = -1
+            backward_parent[person] = -1
+
+
+def expand_compact_layer(frontier, parent, parent_movie, other_parent, touched):
+    """
+    Array-backed counterpart of `expand_layer` for the compact graph.
+    """
+    person_offsets = graph.person_offsets
+    person_movies = graph.person_movies
+    movie_offsets = graph.movie_offsets
+    movie_people = graph.movie_people
+
+    next_frontier = []
+    for person in frontier:
+        for i in range(person_offsets[person], person_offsets[person + 1]):
+            movie = person_movies[i]
+            for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                neighbor = movie_people[j]
+                if parent[neighbor] != -1:
+                    continue
+                parent[neighbor] = person
+                parent_movie[neighbor] = movie
+                touched.append(neighbor)
+                if other_parent[neighbor] != -1:
+                    return next_frontier, neighbor
+                next_frontier.append(neighbor)
+    return next_frontier, None
+
+
+def bidirectional_search(source, target, neighbors):
+    """
+    Searches from both ends over the graph given by `neighbors`, a
+    function from a person to its (movie, person) pairs.
+    """
+    # Maps person -> (movie, person) of the step towards the source
+    forward_parents = {source: None}
+    # Maps person -> (movie, person) of the step towards the target
+    backward_parents = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_layer(
+                forward_frontier, forward_parents, backward_parents, neighbors
+            )
         else:
-            for movie_id, person_id in neighbors_for_person(considered_node.state):
-                frontier.add(Node(action=movie_id, parent=considered_node, state=person_id))
-            explored.append(considered_node)
+            backward_frontier, meeting = expand_layer(
+                backward_frontier, backward_parents, forward_parents, neighbors
+            )
+        if meeting is not None:
+            return join_paths(meeting, forward_parents, backward_parents)
+
+    return None
+
+
+def expand_layer(frontier, parents, other_parents, neighbors):
+    """
+    Expands every person in `frontier` by one step, recording parents.
+
+    Returns the next frontier and the person where this search met the
+    other one (or None). The goal check happens when a neighbor is
+    generated, and the expansion stops at the first meeting.
+    """
+    next_frontier = []
+    for person_id in frontier:
+        for movie_id, neighbor_id in neighbors(person_id):
+            if neighbor_id in parents:
+                continue
+            parents[neighbor_id] = (movie_id, person_id)
+            if neighbor_id in other_parents:
+                return next_frontier, neighbor_id
+            next_frontier.append(neighbor_id)
+    return next_frontier, None
+
+
+def join_paths(meeting, forward_parents, backward_parents):
+    """
+    Builds the (movie_id, person_id) path through the meeting person
+    from the parent maps of both searches.
+    """
+    path = []
+    person_id = meeting
+    while forward_parents[person_id] is not None:
+        movie_id, parent_id = forward_parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent_id
+    path.reverse()
+
+    person_id = meeting
+    while backward_parents[person_id] is not None:
+        movie_id, child_id = backward_parents[person_id]
+        path.append((movie_id, child_id))
+        person_id = child_id
+    return path
+
 
-    # TODO
-    raise NotImplementedError
+def cached_shortest_path(source, target):
+    """
+    Same as `shortest_path`, but answered from `path_cache` or from a
+    cached BFS tree of either endpoint when possible.
+    """
+    if source == target:
+        return []
+
+    key = (source, target) if source <= target else (target, source)
+    path = path_cache.get(key, False)
+    if path is False:
+        path = uncached_path(*key)
+        path_cache.put(key, path)
+
+    if path is None or key[0] == source:
+        return path
+    return reverse_path(path, key[0])
+
+
+def uncached_path(source, target):
+    """
+    Finds the path for a path cache miss, from the cached BFS tree of
+    either endpoint if there is one.
+    """
+    tree = tree_cache.get(source)
+    if tree is not None:
+        return path_from_tree(tree, target)
+    tree = tree_cache.get(target)
+    if tree is not None:
+        path = path_from_tree(tree, source)
+        return None if path is None else reverse_path(path, target)
+    return shortest_path(source, target)
+
+
+def cache_tree(source):
+    """
+    Builds the BFS tree of `source` and keeps it in `tree_cache`, so
+    later `cached_shortest_path` queries involving `source` are answered
+    from it. Meant for endpoints known up front to be popular.
+    """
+    tree = bfs_tree(source)
+    tree_cache.put(source, tree)
+    return tree
+
+
+def reverse_path(path, source):
+    """
+    Turns a (movie_id, person_id) path starting at `source` into the
+    path from its last person back to `source`.
+    """
+    people_on_path = [source] + [person_id for _, person_id in path]
+    return [
+        (path[i][0], people_on_path[i])
+        for i in reversed(range(len(path)))
+    ]
+
+
+def clear_caches():
+    """
+    Empties the path and tree caches along with their counters.
+    """
+    path_cache.clear()
+    tree_cache.clear()
+
+
+def cache_info():
+    """
+    Returns hit/miss counters and sizes of the path and tree caches.
+    """
+    return {"paths": path_cache.info(), "trees": tree_cache.info()}
+
+
+def bfs_tree(source):
+    """
+    Returns the breadth-first search tree rooted at `source`; use
+    `path_from_tree` to read paths out of it.
+
+    With the compact graph the tree is a pair of arrays with one slot per
+    person index: the parent towards the source (-1 if unreachable, the
+    root for the root itself) and the movie linking them. Otherwise it is
+    a dict mapping every reachable person to the (movie, person) step
+    back towards the source.
+    """
+    if graph is not None:
+        return compact_bfs_tree(graph.person_index[source])
+
+    parents = {source: None}
+    frontier = [source]
+    while frontier:
+        frontier, _ = expand_layer(frontier, parents, {}, neighbors_for_person)
+    return parents
 
 
-def person_id_for_name(name):
+def compact_bfs_tree(root):
+    """
+    Array-backed breadth-first search tree of the compact graph, as
+    (parent, movie) arrays.
+    """
+    person_offsets = graph.person_offsets
+    person_movies = graph.person_movies
+    movie_offsets = graph.movie_offsets
+    movie_people = graph.movie_people
+
+    parent = array("l", [-1]) * len(graph.person_ids)
+    parent_movie = array("l", parent)
+    parent[root] = root
+    frontier = [root]
+    while frontier:
+        next_frontier = []
+        for person in frontier:
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    neighbor = movie_people[j]
+                    if parent[neighbor] == -1:
+                        parent[neighbor] = person
+                        parent_movie[neighbor] = movie
+                        next_frontier.append(neighbor)
+        frontier = next_frontier
+    return parent, parent_movie
+
+
+def path_from_tree(tree, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs from the
+    root of a `bfs_tree` to the target, or None if it is not reachable.
+    """
+    if graph is None:
+        if target not in tree:
+            return None
+        path = []
+        person_id = target
+        while tree[person_id] is not None:
+            movie_id, parent_id = tree[person_id]
+            path.append((movie_id, person_id))
+            person_id = parent_id
+        path.reverse()
+        return path
+
+    parent, parent_movie = tree
+    person = graph.person_index[target]
+    if parent[person] == -1:
+        return None
+    path = []
+    while parent[person] != person:
+        path.append((graph.movie_ids[parent_movie[person]], graph.person_ids[person]))
+        person = parent[person]
+    path.reverse()
+    return path
+
+
+def person_id_for_name(name, interactive=True, birth=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    When not `interactive`, ambiguities are resolved by `resolve_person`
+    instead of asking on the terminal.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    person_ids = name_index.exact(name)
     if len(person_ids) == 0:
         return None
+    elif len(person_ids) > 1 and not interactive:
+        return resolve_person(person_ids, birth)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -157,11 +537,72 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def resolve_person(person_ids, birth=None):
+    """
+    Deterministically picks one of several people sharing a name.
+
+    People born in `birth` are preferred if given; then whoever starred
+    in the most movies, with the lowest id breaking ties. Returns None
+    if `birth` matches nobody.
+    """
+    if birth is not None:
+        person_ids = [
+            person_id for person_id in person_ids
+            if people[person_id]["birth"] == str(birth)
+        ]
+        if not person_ids:
+            return None
+    return min(
+        person_ids,
+        key=lambda person_id: (-film_count(person_id), person_id)
+    )
+
+
+def film_count(person_id):
+    """
+    Returns the number of movies a person starred in.
+    """
+    if graph is not None:
+        person = graph.person_index[person_id]
+        return graph.person_offsets[person + 1] - graph.person_offsets[person]
+    return len(people[person_id]["movies"])
+
+
+def search_names(query, max_distance=2, limit=10):
+    """
+    Returns up to `limit` (name, person_id) matches for `query`: exact
+    matches first, then names starting with it, then names within
+    `max_distance` edits of it.
+    """
+    matches = []
+    seen = set()
+
+    def add(name, person_id):
+        if person_id not in seen and len(matches) < limit:
+            seen.add(person_id)
+            matches.append((people[person_id]["name"], person_id))
+
+    for person_id in name_index.exact(query):
+        add(query, person_id)
+    for name, person_id in name_index.prefix(query, limit):
+        add(name, person_id)
+    if len(matches) < limit and max_distance > 0:
+        for _, name, person_id in name_index.fuzzy(query, max_distance, limit):
+            add(name, person_id)
+    return matches
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return set(
+            (graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in graph.neighbors(graph.person_index[person_id])
+        )
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
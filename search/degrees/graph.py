@@ -0,0 +1,131 @@
+from array import array
+
+
+class CompactGraph():
+    """
+    Co-star graph with person and movie ids interned to dense integers.
+
+    Both directions of the person <-> movie relation are stored in CSR
+    form: `person_offsets[i]:person_offsets[i + 1]` slices `person_movies`
+    to give the movies of person `i`, and `movie_offsets` / `movie_people`
+    do the same for the stars of a movie.
+    """
+
+    def __init__(self):
+        self.person_ids = []
+        self.person_index = {}
+        self.movie_ids = []
+        self.movie_index = {}
+        self.person_offsets = array("l", [0])
+        self.person_movies = array("l")
+        self.movie_offsets = array("l", [0])
+        self.movie_people = array("l")
+        self._search_arrays = None
+
+    def add_person(self, person_id):
+        """
+        Interns a person id, returning its integer index.
+        """
+        index = self.person_index.get(person_id)
+        if index is None:
+            index = len(self.person_ids)
+            self.person_index[person_id] = index
+            self.person_ids.append(person_id)
+        return index
+
+    def add_movie(self, movie_id):
+        """
+        Interns a movie id, returning its integer index.
+        """
+        index = self.movie_index.get(movie_id)
+        if index is None:
+            index = len(self.movie_ids)
+            self.movie_index[movie_id] = index
+            self.movie_ids.append(movie_id)
+        return index
+
+    def build(self, person_column, movie_column):
+        """
+        Fills the CSR arrays from two parallel arrays of interned
+        (person, movie) star credits. Duplicate credits are dropped.
+        """
+        seen = set()
+        persons = array("l")
+        movies = array("l")
+        for person, movie in zip(person_column, movie_column):
+            key = person * len(self.movie_ids) + movie
+            if key in seen:
+                continue
+            seen.add(key)
+            persons.append(person)
+            movies.append(movie)
+        del seen
+
+        self.person_offsets, self.person_movies = _csr(
+            persons, movies, len(self.person_ids)
+        )
+        self.movie_offsets, self.movie_people = _csr(
+            movies, persons, len(self.movie_ids)
+        )
+
+    def search_arrays(self):
+        """
+        Returns (forward_parent, forward_movie, backward_parent,
+        backward_movie) arrays with one slot per person, all set to -1.
+
+        They are allocated once per graph and shared by every search, so
+        a search must reset the parent slots it touched before returning.
+        """
+        if self._search_arrays is None:
+            empty = array("l", [-1]) * len(self.person_ids)
+            self._search_arrays = tuple(array("l", empty) for _ in range(4))
+        return self._search_arrays
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person starred in.
+        """
+        return self.person_movies[
+            self.person_offsets[person]:self.person_offsets[person + 1]
+        ]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices who starred in a movie.
+        """
+        return self.movie_people[
+            self.movie_offsets[movie]:self.movie_offsets[movie + 1]
+        ]
+
+    def neighbors(self, person):
+        """
+        Yields (movie, person) index pairs for everyone who starred
+        with `person`, including `person` itself.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_people = self.movie_people
+        for i in range(person_offsets[person], person_offsets[person + 1]):
+            movie = person_movies[i]
+            for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                yield movie, movie_people[j]
+
+
+def _csr(rows, columns, num_rows):
+    """
+    Groups `columns` by `rows` with a counting sort, returning the
+    (offsets, indices) arrays of the resulting CSR structure.
+    """
+    offsets = array("l", [0]) * (num_rows + 1)
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(num_rows):
+        offsets[i + 1] += offsets[i]
+
+    indices = array("l", [0]) * len(rows)
+    cursor = offsets[:-1]
+    for row, column in zip(rows, columns):
+        indices[cursor[row]] = column
+        cursor[row] += 1
+    return offsets, indices
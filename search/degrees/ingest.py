@@ -0,0 +1,123 @@
+"""
+Chunked, parallel parsing of stars.csv for the compact graph.
+
+The file is split into byte ranges that end on line boundaries. Each
+range is read in one go and parsed into two int arrays of interned
+(person, movie) indices, either in this process or in a pool of forked
+workers, and the partial arrays are concatenated in file order.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import sys
+from array import array
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Id -> index maps used by the worker processes, set by _init_worker
+_person_index = None
+_movie_index = None
+
+
+def chunk_ranges(path, chunk_size=CHUNK_SIZE):
+    """
+    Returns (start, end) byte ranges covering the file after its header
+    line, each ending just after a newline.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_chunk(path, start, end, person_index, movie_index):
+    """
+    Parses the star credits in bytes [start, end) of `path`, returning
+    (person_column, movie_column) arrays. Credits naming an unknown
+    person or movie are skipped.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    person_column = array("l")
+    movie_column = array("l")
+    for row in csv.reader(io.StringIO(text)):
+        if len(row) < 2:
+            continue
+        person = person_index.get(row[0])
+        movie = movie_index.get(row[1])
+        if person is None or movie is None:
+            continue
+        person_column.append(person)
+        movie_column.append(movie)
+    return person_column, movie_column
+
+
+def _init_worker(person_index, movie_index):
+    global _person_index, _movie_index
+    _person_index = person_index
+    _movie_index = movie_index
+
+
+def _parse_chunk_in_worker(task):
+    path, start, end = task
+    person_column, movie_column = parse_chunk(
+        path, start, end, _person_index, _movie_index
+    )
+    return end - start, person_column.tobytes(), movie_column.tobytes()
+
+
+def read_star_columns(path, person_index, movie_index, processes=None,
+                      progress=False):
+    """
+    Parses a stars.csv file into (person_column, movie_column) arrays of
+    interned indices, using `processes` forked workers if given.
+
+    With `progress`, the share of the file parsed so far is printed to
+    stderr as chunks complete.
+    """
+    ranges = chunk_ranges(path)
+    total = os.path.getsize(path)
+    # The header line counts as done before any chunk is parsed
+    done = ranges[0][0] if ranges else total
+    person_column = array("l")
+    movie_column = array("l")
+
+    def report(size):
+        nonlocal done
+        done += size
+        if progress:
+            print(f"\rParsing {os.path.basename(path)}: {100 * done / max(total, 1):.0f}%",
+                  end="", file=sys.stderr, flush=True)
+
+    if not processes or processes == 1:
+        for start, end in ranges:
+            persons, movies = parse_chunk(path, start, end, person_index, movie_index)
+            person_column.extend(persons)
+            movie_column.extend(movies)
+            report(end - start)
+    else:
+        context = multiprocessing.get_context("fork")
+        tasks = [(path, start, end) for start, end in ranges]
+        with context.Pool(processes, _init_worker, (person_index, movie_index)) as pool:
+            # imap keeps results in file order while chunks parse in parallel
+            for size, persons, movies in pool.imap(_parse_chunk_in_worker, tasks):
+                person_column.frombytes(persons)
+                movie_column.frombytes(movies)
+                report(size)
+
+    if progress:
+        print(file=sys.stderr)
+    return person_column, movie_column
@@ -0,0 +1,73 @@
+"""
+Load generator for server.py.
+
+Replays the (source, target) pairs of a CSV file (same format as for
+batch.py) against a running server from several concurrent clients and
+reports throughput and latency percentiles.
+
+Usage: python loadgen.py pairs.csv [concurrency] [requests] [port]
+"""
+
+import sys
+import threading
+import time
+
+from batch import read_pairs
+from client import Client
+from server import DEFAULT_PORT
+
+
+def run_client(pairs, count, offset, port, latencies):
+    """
+    Sends `count` path queries, cycling through `pairs` from `offset`,
+    and records each round-trip time in milliseconds.
+    """
+    client = Client(port)
+    for i in range(count):
+        source, target = pairs[(offset + i) % len(pairs)]
+        start = time.perf_counter()
+        client.path(source, target)
+        latencies.append((time.perf_counter() - start) * 1000)
+    client.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4, 5]:
+        sys.exit("Usage: python loadgen.py pairs.csv [concurrency] [requests] [port]")
+    pairs = list(read_pairs(sys.argv[1]))
+    concurrency = int(sys.argv[2]) if len(sys.argv) >= 3 else 8
+    requests = int(sys.argv[3]) if len(sys.argv) >= 4 else 1000
+    port = int(sys.argv[4]) if len(sys.argv) == 5 else DEFAULT_PORT
+    if not pairs:
+        sys.exit("No pairs to send.")
+
+    latencies = []
+    threads = []
+    per_client = -(-requests // concurrency)
+    start = time.perf_counter()
+    for i in range(concurrency):
+        thread = threading.Thread(
+            target=run_client,
+            args=(pairs, per_client, i * per_client, port, latencies)
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Requests: {len(latencies)} in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.1f} req/s, concurrency {concurrency})")
+    print(f"Latency ms: p50 {percentile(latencies, 0.5):.2f}, "
+          f"p95 {percentile(latencies, 0.95):.2f}, "
+          f"p99 {percentile(latencies, 0.99):.2f}, "
+          f"max {latencies[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from records import PackedStrings, RecordTable
+
+# Sorts after every other character, used to find the end of a prefix range
+MAX_CHAR = chr(0x10FFFF)
+
+
+class NameIndex():
+    """
+    Sorted array of lowercase names with their person_ids. The names are
+    packed into one buffer (see records.py) rather than kept as strings,
+    and `order[i]` is the position in `person_ids` of the person named
+    `keys[i]`, so a snapshot can map the whole index (see snapshot.py).
+
+    Exact and prefix lookups are binary searches. Fuzzy lookups walk the
+    names like a trie, one name length at a time: `by_length` lists the
+    key positions sorted by (length, name), so within one length edit
+    distance rows are shared between names with a common prefix, and
+    whole prefix ranges are skipped once no name of that length can end
+    within the distance bound.
+    """
+
+    def __init__(self, keys, order, by_length, person_ids):
+        self.keys = keys
+        self.order = order
+        self.by_length = by_length
+        self.person_ids = person_ids
+
+    @classmethod
+    def build(cls, people):
+        """
+        Builds the index of a people mapping of person_id -> {"name": ...}.
+        A RecordTable's own id list is shared rather than copied.
+        """
+        person_ids = people.ids if isinstance(people, RecordTable) else list(people)
+        entries = sorted(
+            (people[person_id]["name"].lower(), i)
+            for i, person_id in enumerate(person_ids)
+        )
+        keys = PackedStrings()
+        for key, _ in entries:
+            keys.append(key)
+        order = array("l", (i for _, i in entries))
+        by_length = array("l", sorted(
+            range(len(entries)), key=lambda i: (len(entries[i][0]), i)
+        ))
+        return cls(keys, order, by_length, person_ids)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def person_id(self, i):
+        """
+        Returns the person_id of the name at sorted position `i`.
+        """
+        return self.person_ids[self.order[i]]
+
+    def exact(self, name):
+        """
+        Returns the person_ids whose name matches `name`, ignoring case.
+        """
+        name = name.lower()
+        start = bisect_left(self.keys, name)
+        end = bisect_right(self.keys, name, start)
+        return [self.person_id(i) for i in range(start, end)]
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to `limit` (name, person_id) pairs, in name order,
+        whose name starts with `prefix`.
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        end = min(bisect_right(self.keys, prefix + MAX_CHAR, start), start + limit)
+        return [(self.keys[i], self.person_id(i)) for i in range(start, end)]
+
+    def fuzzy(self, name, max_distance=2, limit=10):
+        """
+        Returns up to `limit` (distance, name, person_id) tuples for names
+        within `max_distance` edits of `name`, closest first.
+
+        Unlike exact and prefix lookups, this is not sub-millisecond in
+        general: the cost grows with how many names lie near the query,
+        about 14 ms when it is one of 200k near-identical names.
+        """
+        query = name.lower()
+        matches = []
+        for length in range(max(0, len(query) - max_distance),
+                            len(query) + max_distance + 1):
+            self._fuzzy_length(query, length, max_distance, matches)
+        matches.sort()
+        return matches[:limit]
+
+    def _fuzzy_length(self, query, length, max_distance, matches):
+        """
+        Adds the matches among names of exactly `length` characters.
+        """
+        keys = self.keys
+        by_length = self.by_length
+
+        def name_length(index):
+            return len(keys[index])
+
+        i = bisect_left(by_length, length, key=name_length)
+        end = bisect_right(by_length, length, i, key=name_length)
+
+        # rows[d] is the edit distance row for the first d characters of a key
+        rows = [list(range(len(query) + 1))]
+        previous = ""
+        while i < end:
+            key = keys[by_length[i]]
+            common = min(_common_prefix(previous, key), len(rows) - 1)
+            del rows[common + 1:]
+            previous = key
+
+            pruned = False
+            for depth in range(common, length):
+                row, bound = _next_row(
+                    rows[-1], query, key[depth], depth + 1, length, max_distance
+                )
+                rows.append(row)
+                if bound > max_distance:
+                    pruned = True
+                    break
+
+            if pruned:
+                i = _skip_prefix(keys, by_length, key[:len(rows) - 1], i, end)
+                continue
+            if rows[-1][-1] <= max_distance:
+                matches.append((rows[-1][-1], key, self.person_id(by_length[i])))
+            i += 1
+
+
+def _skip_prefix(keys, by_length, prefix, i, end):
+    """
+    Returns the first position after `i` (and before `end`) whose key
+    does not start with `prefix`. Pruned ranges are usually short, so
+    the search gallops forward from `i` before bisecting.
+    """
+    bound = prefix + MAX_CHAR
+    step = 1
+    while i + step < end and keys[by_length[i + step]] <= bound:
+        step *= 2
+    return bisect_right(
+        by_length, bound, i + step // 2, min(i + step, end), key=keys.__getitem__
+    )
+
+
+def _common_prefix(a, b):
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+def _next_row(last, query, char, depth, length, max_distance):
+    """
+    Extends a Levenshtein row by one character of the key, the one at
+    `depth` of a key of `length` characters.
+
+    Only the band of cells within `max_distance` of the diagonal is
+    computed; the rest can never get back under the bound and are
+    capped at max_distance + 1. Also returns the smallest final distance
+    the key can still reach: ending at query position j costs at least
+    row[j] plus the difference of the lengths left on each side.
+    """
+    cap = max_distance + 1
+    row = [cap] * len(last)
+    row[0] = min(last[0] + 1, cap)
+    remaining = length - depth
+    bound = row[0] + abs(remaining - len(query))
+    for j in range(max(1, depth - max_distance), min(len(query), depth + max_distance) + 1):
+        cell = min(
+            row[j - 1] + 1,
+            last[j] + 1,
+            last[j - 1] + (query[j - 1] != char),
+            cap,
+        )
+        row[j] = cell
+        bound = min(bound, cell + abs(remaining - (len(query) - j)))
+    return row, bound
@@ -0,0 +1,77 @@
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+class PackedStrings(Sequence):
+    """
+    Sequence of strings stored back to back in one UTF-8 buffer, with
+    string `i` at `data[offsets[i]:offsets[i + 1]]`. Strings are decoded
+    when they are read, so no per-string objects are kept. Offsets are
+    32-bit, which limits a buffer to 4 GiB of text.
+    """
+
+    def __init__(self, offsets=None, data=None):
+        self.offsets = array("I", [0]) if offsets is None else offsets
+        self.data = bytearray() if data is None else data
+
+    def append(self, value):
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("PackedStrings index out of range")
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class RecordTable(Mapping):
+    """
+    Read-only mapping from ids to small dicts of string fields, such as
+    {"name": ..., "birth": ...}, for the compact graph.
+
+    Rows are numbered by the graph's interned indices, and field `k` of
+    row `i` is string `i * width + k` of a PackedStrings. The dict for a
+    row is only built when it is looked up.
+    """
+
+    def __init__(self, ids, index, fields, values=None):
+        self.ids = ids
+        self.index = index
+        self.fields = tuple(fields)
+        self.values = PackedStrings() if values is None else values
+
+    def append(self, *values):
+        """
+        Adds the next row, with one value per field.
+        """
+        for value in values:
+            self.values.append(value)
+
+    def value(self, row, field):
+        """
+        Returns one field of a row, by row index and field position.
+        """
+        return self.values[row * len(self.fields) + field]
+
+    def row(self, row):
+        """
+        Returns the dict of fields of a row, by row index.
+        """
+        return {field: self.value(row, k) for k, field in enumerate(self.fields)}
+
+    def __getitem__(self, key):
+        return self.row(self.index[key])
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
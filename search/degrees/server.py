@@ -0,0 +1,198 @@
+"""
+Resident degrees query server.
+
+Loads a dataset once and answers queries over HTTP on localhost. An
+asyncio front end parses requests and hands the searches to a pool of
+forked worker processes that share the loaded dataset.
+
+Usage: python server.py [--tree person_id ...] directory [port] [workers]
+
+Each `--tree` person gets a BFS tree built before the workers are forked,
+so every worker answers paths from or to that person from the shared
+tree instead of searching.
+
+Endpoints (all GET, JSON responses):
+    /path?source=<person_id>&target=<person_id>
+    /names?q=<name>&limit=<n>
+    /stats
+
+Every response carries the time spent handling it in "latency_ms".
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import degrees
+
+DEFAULT_PORT = 8050
+
+stats = {"requests": 0, "errors": 0, "total_latency_ms": 0.0}
+
+
+def find_path(source, target):
+    """
+    Worker-side path query, returning a JSON-ready dict.
+    """
+    for person_id in (source, target):
+        if person_id not in degrees.people:
+            return {"error": f"unknown person {person_id}"}
+    path = degrees.cached_shortest_path(source, target)
+    if path is None:
+        return {"source": source, "target": target, "degrees": None, "path": None}
+    return {
+        "source": source,
+        "target": target,
+        "degrees": len(path),
+        "path": [
+            {
+                "movie_id": movie_id,
+                "title": degrees.movies[movie_id]["title"],
+                "person_id": person_id,
+                "name": degrees.people[person_id]["name"],
+            }
+            for movie_id, person_id in path
+        ],
+    }
+
+
+def find_names(query, limit):
+    """
+    Worker-side name lookup, returning a JSON-ready dict.
+    """
+    return {
+        "query": query,
+        "matches": [
+            {"name": name, "person_id": person_id}
+            for name, person_id in degrees.search_names(query, limit=limit)
+        ],
+    }
+
+
+async def handle(reader, writer, pool):
+    """
+    Serves one HTTP/1.1 connection, with keep-alive.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            keep_alive = True
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                if header.lower().startswith(b"connection:") and b"close" in header.lower():
+                    keep_alive = False
+
+            start = time.perf_counter()
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                status, body = await route(method, target, loop, pool)
+            except ValueError:
+                status, body = 400, {"error": "bad request"}
+            latency = (time.perf_counter() - start) * 1000
+
+            stats["requests"] += 1
+            stats["total_latency_ms"] += latency
+            if status != 200:
+                stats["errors"] += 1
+            body["latency_ms"] = round(latency, 3)
+
+            payload = json.dumps(body).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                f"\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def route(method, target, loop, pool):
+    """
+    Dispatches a request, returning (status, JSON-ready body).
+    """
+    if method != "GET":
+        return 405, {"error": "only GET is supported"}
+    url = urlsplit(target)
+    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+    if url.path == "/path":
+        if "source" not in query or "target" not in query:
+            return 400, {"error": "source and target are required"}
+        body = await loop.run_in_executor(
+            pool, find_path, query["source"], query["target"]
+        )
+    elif url.path == "/names":
+        if "q" not in query:
+            return 400, {"error": "q is required"}
+        body = await loop.run_in_executor(
+            pool, find_names, query["q"], int(query.get("limit", 10))
+        )
+    elif url.path == "/stats":
+        body = dict(stats)
+        if stats["requests"]:
+            body["mean_latency_ms"] = stats["total_latency_ms"] / stats["requests"]
+    else:
+        return 404, {"error": "not found"}
+    return (400 if "error" in body else 200), body
+
+
+async def serve(port, workers):
+    # Fork after loading so workers share the dataset copy-on-write
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        server = await asyncio.start_server(
+            lambda reader, writer: handle(reader, writer, pool),
+            "127.0.0.1", port
+        )
+        print(f"Serving on http://127.0.0.1:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    args = sys.argv[1:]
+    trees = []
+    while "--tree" in args[:-1]:
+        i = args.index("--tree")
+        trees.append(args.pop(i + 1))
+        args.pop(i)
+    if len(args) not in [1, 2, 3]:
+        sys.exit("Usage: python server.py [--tree person_id ...] directory [port] [workers]")
+    directory = args[0]
+    port = int(args[1]) if len(args) >= 2 else DEFAULT_PORT
+    workers = int(args[2]) if len(args) == 3 else os.cpu_count()
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory, compact=True)
+    degrees.tree_cache.resize(max(degrees.tree_cache.maxsize, len(trees)))
+    for person_id in trees:
+        if person_id not in degrees.people:
+            sys.exit(f"Unknown person {person_id}.")
+        degrees.cache_tree(person_id)
+    print("Data loaded.", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(port, workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
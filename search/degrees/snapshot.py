@@ -0,0 +1,188 @@
+"""
+Binary snapshot of a compact degrees dataset.
+
+`python snapshot.py directory` loads the CSVs once and writes
+`directory/degrees.snapshot`. Later calls to `degrees.load_data` map
+that file instead of parsing the CSVs, as long as the CSVs have not
+changed since the snapshot was written.
+
+Layout: a fixed header (magic, version, JSON metadata length), the JSON
+metadata (source file signatures and section sizes), then 8-byte aligned
+sections: the four CSR int64 arrays, the offsets and UTF-8 data of the
+person and movie RecordTables, the sorted keys, person order and length
+order of the NameIndex, and a string table of person and movie ids.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from graph import CompactGraph
+from nameindex import NameIndex
+from records import PackedStrings, RecordTable
+
+MAGIC = b"DEGSNAP\0"
+VERSION = 3
+FILENAME = "degrees.snapshot"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+HEADER = struct.Struct("<8sII")
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_people")
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, FILENAME)
+
+
+def source_signature(directory):
+    """
+    Returns the size and modification time of each source CSV, used to
+    detect when a snapshot has gone stale.
+    """
+    signature = {}
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        signature[filename] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def write_snapshot(directory, graph, people, movies, name_index):
+    """
+    Writes `graph`, the person and movie RecordTables and the NameIndex
+    built over them to a snapshot file in `directory`.
+    """
+    sections = [array("q", getattr(graph, name)).tobytes() for name in ARRAYS]
+    for table in (people, movies):
+        sections.append(array("q", table.values.offsets).tobytes())
+        sections.append(bytes(table.values.data))
+    sections.append(array("q", name_index.keys.offsets).tobytes())
+    sections.append(bytes(name_index.keys.data))
+    sections.append(array("q", name_index.order).tobytes())
+    sections.append(array("q", name_index.by_length).tobytes())
+    sections.append("\0".join(graph.person_ids + graph.movie_ids).encode("utf-8"))
+
+    metadata = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": source_signature(directory),
+        "num_people": len(graph.person_ids),
+        "num_movies": len(graph.movie_ids),
+        "sections": [len(section) for section in sections],
+    }).encode("utf-8")
+
+    # Write to a temporary file first so readers never see a partial file
+    path = snapshot_path(directory)
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(metadata)))
+        f.write(metadata)
+        f.write(b"\0" * _padding(f.tell()))
+        for section in sections:
+            f.write(section)
+            f.write(b"\0" * _padding(f.tell()))
+    os.replace(path + ".tmp", path)
+
+
+def read_metadata(f):
+    """
+    Returns the header metadata of an open snapshot file, or None if
+    it is not a snapshot of the current version.
+    """
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    magic, version, length = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def is_fresh(directory):
+    """
+    Returns True if `directory` holds a snapshot that matches the
+    current source CSVs.
+    """
+    try:
+        with open(snapshot_path(directory), "rb") as f:
+            metadata = read_metadata(f)
+        return (
+            metadata is not None
+            and metadata["byteorder"] == sys.byteorder
+            and metadata["sources"] == source_signature(directory)
+        )
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def load_snapshot(directory):
+    """
+    Maps the snapshot in `directory` into memory.
+
+    Returns (graph, people, movies, name_index) in the same shape that
+    `degrees.load_data(directory, compact=True)` builds. The CSR arrays,
+    the record data and the name index are views on the mapped file, so their pages are
+    shared between processes that load the same snapshot.
+    """
+    with open(snapshot_path(directory), "rb") as f:
+        metadata = read_metadata(f)
+        if metadata is None:
+            raise ValueError("not a degrees snapshot")
+        offset = f.tell()
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    offset += _padding(offset)
+    sections = []
+    for size in metadata["sections"]:
+        sections.append(view[offset:offset + size])
+        offset += size + _padding(offset + size)
+
+    graph = CompactGraph()
+    graph.buffer = buffer
+    for name, section in zip(ARRAYS, sections):
+        setattr(graph, name, section.cast("q"))
+
+    num_people = metadata["num_people"]
+    ids = str(sections[-1], "utf-8").split("\0")
+    graph.person_ids = ids[:num_people]
+    graph.movie_ids = ids[num_people:num_people + metadata["num_movies"]]
+    graph.person_index = dict(zip(graph.person_ids, range(num_people)))
+    graph.movie_index = dict(zip(graph.movie_ids, range(len(graph.movie_ids))))
+
+    people = RecordTable(
+        graph.person_ids, graph.person_index, ("name", "birth"),
+        PackedStrings(sections[4].cast("q"), sections[5])
+    )
+    movies = RecordTable(
+        graph.movie_ids, graph.movie_index, ("title", "year"),
+        PackedStrings(sections[6].cast("q"), sections[7])
+    )
+    name_index = NameIndex(
+        PackedStrings(sections[8].cast("q"), sections[9]),
+        sections[10].cast("q"), sections[11].cast("q"), graph.person_ids
+    )
+    return graph, people, movies, name_index
+
+
+def _padding(offset):
+    return -offset % 8
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python snapshot.py directory")
+    directory = sys.argv[1]
+
+    import degrees
+    print("Loading data...")
+    degrees.load_data(directory, compact=True, use_snapshot=False)
+    print("Writing snapshot...")
+    write_snapshot(
+        directory, degrees.graph, degrees.people, degrees.movies, degrees.name_index
+    )
+    print(f"Snapshot written to {snapshot_path(directory)}.")
+
+
+if __name__ == "__main__":
+    main()
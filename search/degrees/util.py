@@ -1,4 +1,11 @@
+import heapq
+import itertools
+from collections import deque
+
+
 class Node():
+    __slots__ = ("state", "parent", "action")
+
     def __init__(self, state, parent, action):
         self.state = state
         self.parent = parent
@@ -7,13 +14,16 @@ class Node():
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        # Maps each state in the frontier to how many nodes hold it
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,10 +32,17 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.discard_state(node.state)
             return node
 
+    def discard_state(self, state):
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
+
 
 class QueueFrontier(StackFrontier):
 
@@ -33,6 +50,48 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
             return node
+
+
+class PriorityFrontier():
+    """
+    Frontier for informed search that always removes the node with the
+    lowest priority. Adding a state that is already in the frontier with
+    a lower priority replaces it (decrease-key); the old heap entry is
+    left in place and skipped when it surfaces.
+    """
+
+    def __init__(self):
+        self.frontier = []
+        # Maps each state in the frontier to its live [priority, count, node] entry
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def add(self, node, priority):
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[2] = None
+        entry = [priority, next(self.counter), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.frontier, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def priority(self, state):
+        return self.entries[state][0]
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def remove(self):
+        while self.frontier:
+            _, _, node = heapq.heappop(self.frontier)
+            if node is not None:
+                del self.entries[node.state]
+                return node
+        raise Exception("empty frontier")
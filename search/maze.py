@@ -1,7 +1,12 @@
+import heapq
+import itertools
 import sys
+from collections import deque
 from typing import override
 
 class Node():
+    __slots__ = ("state", "parent", "action") #No per-instance __dict__, nodes are allocated per generated edge
+
     def __init__(self, state, parent, action):
         self.state = state
         self.parent = parent
@@ -11,13 +16,15 @@ class Node():
 class StackFrontier():
 
     def __init__(self):
-            self.frontier = []
+            self.frontier = deque()
+            self.states = {} #Maps each state in the frontier to how many nodes hold it
 
     def add(self, node: Node) -> None:
             self.frontier.append(node)
+            self.states[node.state] = self.states.get(node.state, 0) + 1
     
     def contains_state(self, state) -> bool:
-        return any(node.state == state for node in self.frontier) #Assumes that the frontier contains nodes as defined above
+        return state in self.states #O(1) lookup instead of scanning the frontier
     
     def empty(self) -> bool:
         return len(self.frontier) == 0
@@ -26,19 +33,63 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
+            node = self.frontier.pop()
+            self.discard_state(node.state)
             return node
+
+    def discard_state(self, state) -> None:
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
         
 class QueueFrontier(StackFrontier):
     
     @override
-    def remove(self): 
+    def remove(self) -> Node:
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.discard_state(node.state)
             return node
 
+class PriorityFrontier():
+    """
+    Removes the node with the lowest priority first (for informed search).
+    Re-adding a state with a lower priority replaces it; the stale heap
+    entry is skipped when it is popped (lazy deletion).
+    """
+
+    def __init__(self):
+        self.frontier = []
+        self.entries = {} #Maps each state in the frontier to its live [priority, count, node] entry
+        self.counter = itertools.count()
+
+    def add(self, node: Node, priority) -> None:
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[2] = None
+        entry = [priority, next(self.counter), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.frontier, entry)
+
+    def contains_state(self, state) -> bool:
+        return state in self.entries
+
+    def empty(self) -> bool:
+        return len(self.entries) == 0
+
+    def remove(self) -> Node:
+        while self.frontier:
+            _, _, node = heapq.heappop(self.frontier)
+            if node is not None:
+                del self.entries[node.state]
+                return node
+        raise Exception("empty frontier")
+
 class Maze():
      pass
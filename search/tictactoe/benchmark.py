@@ -0,0 +1,191 @@
+"""
+Headless self-play benchmark for the Tic Tac Toe engines.
+
+Usage: python benchmark.py [games] [output.json]
+
+Plays `games` games of AI vs AI and of AI vs a random player (the AI
+alternating between X and O) for every engine configuration, without
+importing pygame. For every AI move it records the time taken and the
+positions searched, and checks the move against an independent
+perfect-play oracle. Writes a JSON report (to stdout if no file is
+given) and exits with status 1 if any AI move was suboptimal.
+"""
+
+import json
+import math
+import random
+import sys
+import time
+from functools import lru_cache
+
+import bitboard
+import mnk
+import tictactoe as ttt
+
+
+def oracle_value(board):
+    """
+    Game value of a board under perfect play, by plain memoized
+    minimax over the full tree (no pruning, no book).
+    """
+    return _oracle(tuple(position for row in board for position in row))
+
+
+@lru_cache(maxsize=None)
+def _oracle(cells):
+    board = [list(cells[0:3]), list(cells[3:6]), list(cells[6:9])]
+    if ttt.terminal(board):
+        return ttt.utility(board)
+    values = [_oracle(_cells(ttt.result(board, action))) for action in ttt.actions(board)]
+    return max(values) if ttt.player(board) == ttt.X else min(values)
+
+
+def _cells(board):
+    return tuple(position for row in board for position in row)
+
+
+def list_engine(board):
+    ttt.nodes = 0
+    action = ttt.search(board)
+    return action, ttt.nodes
+
+
+def list_engine_cold(board):
+    ttt.transposition_table.clear()
+    return list_engine(board)
+
+
+def book_engine(board):
+    ttt.nodes = 0
+    action = ttt.minimax(board)
+    return action, ttt.nodes
+
+
+def bitboard_engine(board):
+    bitboard.nodes = 0
+    action = bitboard.minimax(board)
+    return action, bitboard.nodes
+
+
+MNK_GAME = mnk.MNKGame(3, 3, 3)
+
+
+def mnk_engine(board):
+    action, _, _ = mnk.search(MNK_GAME, board, time_limit=60)
+    return action, mnk.nodes
+
+
+# Name -> function(board) returning (action, positions searched)
+ENGINES = {
+    "alphabeta-tt-cold": list_engine_cold,
+    "alphabeta-tt-warm": list_engine,
+    "opening-book": book_engine,
+    "bitboard": bitboard_engine,
+    "mnk-iterative-deepening": mnk_engine,
+}
+
+
+def play(engine, ai_players, rng, moves):
+    """
+    Plays one game where `ai_players` move with `engine` and anyone else
+    moves at random. Appends a record per AI move to `moves` and returns
+    the winner.
+    """
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        if ttt.player(board) in ai_players:
+            start = time.perf_counter()
+            action, nodes = engine(board)
+            seconds = time.perf_counter() - start
+            moves.append({
+                "seconds": seconds,
+                "nodes": nodes,
+                "optimal": oracle_value(ttt.result(board, action)) == oracle_value(board),
+                "board": _cells(board),
+                "action": action,
+            })
+        else:
+            action = rng.choice(sorted(ttt.actions(board)))
+        board = ttt.result(board, action)
+    return ttt.winner(board)
+
+
+def nps_histogram(moves):
+    """
+    Buckets moves by nodes per second into powers of two, keyed by the
+    bucket's lower bound.
+    """
+    counts = {}
+    for move in moves:
+        if move["nodes"] == 0 or move["seconds"] == 0:
+            bucket = 0
+        else:
+            bucket = 2 ** int(math.log2(move["nodes"] / move["seconds"]))
+        counts[bucket] = counts.get(bucket, 0) + 1
+    return {str(bucket): counts[bucket] for bucket in sorted(counts)}
+
+
+def summarize(moves, results):
+    seconds = sorted(move["seconds"] for move in moves)
+    total_seconds = sum(seconds)
+    total_nodes = sum(move["nodes"] for move in moves)
+    return {
+        "results": results,
+        "moves": len(moves),
+        "suboptimal_moves": [
+            {"board": move["board"], "action": move["action"]}
+            for move in moves if not move["optimal"]
+        ],
+        "total_nodes": total_nodes,
+        "mean_ms_per_move": 1000 * total_seconds / len(moves) if moves else 0,
+        "max_ms_per_move": 1000 * seconds[-1] if moves else 0,
+        "nodes_per_second": total_nodes / total_seconds if total_seconds else 0,
+        "nodes_per_second_histogram": nps_histogram(moves),
+    }
+
+
+def benchmark(games=20, seed=0):
+    """
+    Runs every engine configuration and returns the JSON-ready report.
+    """
+    report = {"games": games, "seed": seed, "engines": {}}
+    for name, engine in ENGINES.items():
+        rng = random.Random(seed)
+        modes = {}
+        for mode, ai_for in (
+            ("ai-vs-ai", lambda game: {ttt.X, ttt.O}),
+            ("ai-vs-random", lambda game: {ttt.X if game % 2 == 0 else ttt.O}),
+        ):
+            moves = []
+            results = {ttt.X: 0, ttt.O: 0, "tie": 0}
+            for game in range(games):
+                winner = play(engine, ai_for(game), rng, moves)
+                results[winner or "tie"] += 1
+            modes[mode] = summarize(moves, results)
+        report["engines"][name] = modes
+    return report
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark.py [games] [output.json]")
+    games = int(sys.argv[1]) if len(sys.argv) >= 2 else 20
+
+    report = benchmark(games)
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    failures = sum(
+        len(mode["suboptimal_moves"])
+        for modes in report["engines"].values() for mode in modes.values()
+    )
+    if failures:
+        sys.exit(f"{failures} suboptimal AI moves.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Bitboard Tic Tac Toe engine
+
+A board is a pair of 9-bit integers (x, o), with bit 3 * i + j set when
+the player occupies cell (i, j). Moves are single bits, so `result`
+allocates nothing but the new tuple.
+"""
+
+import math
+
+import tictactoe as ttt
+
+FULL = 0b111111111
+
+# The 8 winning lines as bit masks
+LINES = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+# Move bits, center first, then corners, then edges
+MOVE_ORDER = (1 << 4, 1 << 0, 1 << 2, 1 << 6, 1 << 8, 1 << 1, 1 << 3, 1 << 5, 1 << 7)
+
+# Number of positions visited by negamax since the last reset
+nodes = 0
+
+
+def initial_state():
+    return (0, 0)
+
+
+def from_board(board):
+    """
+    Converts a list-of-lists board from tictactoe.py to a bitboard.
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, position in enumerate(row):
+            if position == ttt.X:
+                x |= 1 << (3 * i + j)
+            elif position == ttt.O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(state):
+    """
+    Converts a bitboard back to the list-of-lists format.
+    """
+    x, o = state
+    return [
+        [ttt.X if x >> (3 * i + j) & 1 else ttt.O if o >> (3 * i + j) & 1 else ttt.EMPTY
+         for j in range(3)]
+        for i in range(3)
+    ]
+
+
+def to_action(move):
+    """
+    Converts a move bit to an (i, j) action.
+    """
+    return divmod(move.bit_length() - 1, 3)
+
+
+def from_action(action):
+    return 1 << (3 * action[0] + action[1])
+
+
+def player(state):
+    x, o = state
+    return ttt.X if bin(x).count("1") == bin(o).count("1") else ttt.O
+
+
+def actions(state):
+    """
+    Yields the bit of every empty cell, lowest first.
+    """
+    empty = ~(state[0] | state[1]) & FULL
+    while empty:
+        move = empty & -empty
+        yield move
+        empty ^= move
+
+
+def result(state, move):
+    x, o = state
+    if (x | o) & move:
+        raise Exception("invalid move")
+    if bin(x).count("1") == bin(o).count("1"):
+        return (x | move, o)
+    return (x, o | move)
+
+
+def has_line(bits):
+    for line in LINES:
+        if bits & line == line:
+            return True
+    return False
+
+
+def winner(state):
+    if has_line(state[0]):
+        return ttt.X
+    if has_line(state[1]):
+        return ttt.O
+    return None
+
+
+def terminal(state):
+    return (state[0] | state[1]) == FULL or winner(state) is not None
+
+
+def utility(state):
+    if has_line(state[0]):
+        return 1
+    if has_line(state[1]):
+        return -1
+    return 0
+
+
+def negamax(own, other, alpha, beta, table):
+    """
+    Returns the value of the position for the player to move, who holds
+    the cells in `own`, with alpha-beta pruning and a transposition
+    table keyed on (own, other).
+    """
+    global nodes
+    nodes += 1
+
+    # The previous move was by `other`, so only they can have just won
+    for line in LINES:
+        if other & line == line:
+            return -1
+    occupied = own | other
+    if occupied == FULL:
+        return 0
+
+    key = (own, other)
+    if key in table:
+        return table[key]
+
+    alpha_in = alpha
+    value = -math.inf
+    for move in MOVE_ORDER:
+        if occupied & move:
+            continue
+        value = max(value, -negamax(other, own | move, -beta, -alpha, table))
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+    # Only exact values are stored, so cut-off results are never reused
+    if alpha_in < value < beta:
+        table[key] = value
+    return value
+
+
+def best_move(state, table=None):
+    """
+    Returns the optimal move bit for the player to move, or None if the
+    game is over.
+    """
+    if terminal(state):
+        return None
+    if table is None:
+        table = {}
+
+    x, o = state
+    own, other = (x, o) if player(state) == ttt.X else (o, x)
+    occupied = x | o
+    best, best_value = None, -math.inf
+    for move in MOVE_ORDER:
+        if occupied & move:
+            continue
+        value = -negamax(other, own | move, -math.inf, -best_value, table)
+        if value > best_value:
+            best, best_value = move, value
+            if best_value == 1:
+                break
+    return best
+
+
+def minimax(board):
+    """
+    Drop-in replacement for tictactoe.minimax on list-of-lists boards.
+    """
+    move = best_move(from_board(board))
+    return None if move is None else to_action(move)
@@ -0,0 +1,66 @@
+"""
+Generates the perfect-play opening book used by tictactoe.minimax.
+
+Usage: python book.py [output]
+
+Enumerates every position reachable from the empty board, solves it
+with tictactoe's alpha-beta search and writes one byte per base-3
+position index: the game value and the best move's cell.
+"""
+
+import sys
+
+import tictactoe as ttt
+
+
+def reachable_positions():
+    """
+    Returns every board reachable from the initial state.
+    """
+    boards = {}
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        index = ttt.position_index(board)
+        if index in boards:
+            continue
+        boards[index] = board
+        if not ttt.terminal(board):
+            for action in ttt.actions(board):
+                stack.append(ttt.result(board, action))
+    return boards
+
+
+def value(board):
+    if ttt.terminal(board):
+        return ttt.utility(board)
+    if ttt.player(board) == ttt.X:
+        return ttt.max_value(board)
+    return ttt.min_value(board)
+
+
+def build_book():
+    """
+    Returns the opening book as bytes.
+    """
+    table = bytearray([ttt.NOT_IN_BOOK]) * 3 ** 9
+    for index, board in reachable_positions().items():
+        action = ttt.search(board)
+        cell = ttt.NO_MOVE if action is None else 3 * action[0] + action[1]
+        table[index] = (value(board) + 1) << 4 | cell
+    return bytes(table)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [output]")
+    path = sys.argv[1] if len(sys.argv) == 2 else ttt.BOOK_PATH
+    table = build_book()
+    with open(path, "wb") as f:
+        f.write(table)
+    covered = sum(1 for entry in table if entry != ttt.NOT_IN_BOOK)
+    print(f"Wrote {covered} positions to {path}.")
+
+
+if __name__ == "__main__":
+    main()
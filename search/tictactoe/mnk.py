@@ -0,0 +1,350 @@
+"""
+Generalized m,n,k-game (k in a row on an m x n board)
+
+Boards use the same list-of-lists format and X / O / EMPTY markers as
+tictactoe.py, so a 3,3,3 game is plain Tic Tac Toe. Since exhaustive
+minimax is out of reach on larger boards, `search` runs iterative
+deepening alpha-beta under a time budget with a pluggable heuristic.
+"""
+
+import math
+import multiprocessing
+import os
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Score of a won position; wins found sooner score slightly higher
+WIN = 10 ** 9
+
+# Number of positions visited by the last call to search
+nodes = 0
+
+# Set in each worker process of parallel_search by _init_worker
+_worker_game = None
+_worker_evaluate = None
+_shared_alpha = None
+
+# Boards with more cells than this only consider moves next to a stone
+FULL_WIDTH_CELLS = 25
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNKGame():
+    """
+    An m,n,k-game: `rows` x `columns` board, `k` in a row wins.
+    """
+
+    def __init__(self, rows=3, columns=3, k=3):
+        if k > max(rows, columns):
+            raise ValueError("win length does not fit on the board")
+        self.rows = rows
+        self.columns = columns
+        self.k = k
+
+        # Every run of k cells (as flat indices) that wins when filled
+        self.windows = []
+        for i in range(rows):
+            for j in range(columns):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < columns:
+                        self.windows.append(tuple(
+                            (i + di * step) * columns + j + dj * step
+                            for step in range(k)
+                        ))
+        # For each cell, the windows passing through it
+        self.windows_through = [[] for _ in range(rows * columns)]
+        for window in self.windows:
+            for cell in window:
+                self.windows_through[cell].append(window)
+
+    def initial_state(self):
+        return [[EMPTY] * self.columns for _ in range(self.rows)]
+
+    def player(self, board):
+        cells = flatten(board)
+        return X if cells.count(X) == cells.count(O) else O
+
+    def actions(self, board):
+        return set(
+            (i, j) for i in range(self.rows) for j in range(self.columns)
+            if board[i][j] is EMPTY
+        )
+
+    def result(self, board, action):
+        i, j = action
+        if board[i][j] is not EMPTY:
+            raise Exception("invalid move")
+        resulting_board = [list(row) for row in board]
+        resulting_board[i][j] = self.player(board)
+        return resulting_board
+
+    def winner(self, board):
+        cells = flatten(board)
+        for window in self.windows:
+            first = cells[window[0]]
+            if first is not EMPTY and all(cells[cell] == first for cell in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        return self.winner(board) is not None or all(
+            position is not EMPTY for row in board for position in row
+        )
+
+    def utility(self, board):
+        winning_player = self.winner(board)
+        return 1 if winning_player == X else -1 if winning_player == O else 0
+
+    def completes_window(self, cells, cell):
+        """
+        Returns True if the stone on `cell` completes a line of k.
+        """
+        mark = cells[cell]
+        for window in self.windows_through[cell]:
+            if all(cells[other] == mark for other in window):
+                return True
+        return False
+
+    def candidate_moves(self, cells):
+        """
+        Returns the empty cells worth searching: all of them on small
+        boards, otherwise those next to a stone (the center if there
+        are none).
+        """
+        empty = [cell for cell, mark in enumerate(cells) if mark is EMPTY]
+        if not empty or len(cells) <= FULL_WIDTH_CELLS:
+            return empty
+        columns = self.columns
+        near = []
+        for cell in empty:
+            i, j = divmod(cell, columns)
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    ni, nj = i + di, j + dj
+                    if (0 <= ni < self.rows and 0 <= nj < columns
+                            and cells[ni * columns + nj] is not EMPTY):
+                        break
+                else:
+                    continue
+                near.append(cell)
+                break
+        if not near:
+            return [(self.rows // 2) * columns + self.columns // 2]
+        return near
+
+
+def flatten(board):
+    return [position for row in board for position in row]
+
+
+def line_evaluator(game, cells):
+    """
+    Default heuristic, from X's point of view: every window still open
+    to only one player scores 4 ** (that player's stones in it).
+    """
+    score = 0
+    for window in game.windows:
+        x = o = 0
+        for cell in window:
+            mark = cells[cell]
+            if mark == X:
+                x += 1
+            elif mark == O:
+                o += 1
+        if o == 0 and x:
+            score += 4 ** x
+        elif x == 0 and o:
+            score -= 4 ** o
+    return score
+
+
+def search(game, board, time_limit=1.0, evaluate=line_evaluator, max_depth=None):
+    """
+    Iterative deepening alpha-beta search for the player to move.
+
+    Searches depth 1, 2, ... until `time_limit` seconds have passed (or
+    `max_depth` is reached, or the result is proven) and returns
+    (action, value, depth) from the deepest completed iteration, with
+    value from the mover's point of view. `evaluate(game, cells)` scores
+    a flat cell list from X's point of view.
+    """
+    global nodes
+    cells = flatten(board)
+    empty = cells.count(EMPTY)
+    if game.terminal(board):
+        return None, 0, 0
+    if max_depth is None or max_depth > empty:
+        max_depth = empty
+
+    sign = 1 if game.player(board) == X else -1
+    deadline = time.perf_counter() + time_limit
+    counter = [0]
+    best_action, best_value, depth_reached = None, 0, 0
+    order = game.candidate_moves(cells)
+
+    for depth in range(1, max_depth + 1):
+        try:
+            value, move = root_search(
+                game, cells, depth, sign, evaluate, order, deadline, counter
+            )
+        except SearchTimeout:
+            break
+        best_action = divmod(move, game.columns)
+        best_value, depth_reached = value, depth
+        # Search the previous best move first in the next iteration
+        order = [move] + [cell for cell in order if cell != move]
+        if abs(value) >= WIN - empty:
+            break
+
+    nodes = counter[0]
+    if best_action is None:
+        # Not even depth 1 finished: fall back to the first candidate
+        best_action = divmod(order[0], game.columns)
+    return best_action, best_value, depth_reached
+
+
+def root_search(game, cells, depth, sign, evaluate, order, deadline, counter):
+    alpha, beta = -math.inf, math.inf
+    best_move = order[0]
+    mark = X if sign == 1 else O
+    for move in order:
+        cells[move] = mark
+        try:
+            if game.completes_window(cells, move):
+                value = WIN
+            else:
+                value = -negamax(game, cells, depth - 1, 1, -sign, -beta, -alpha,
+                                 evaluate, deadline, counter)
+        finally:
+            cells[move] = EMPTY
+        if value > alpha:
+            alpha, best_move = value, move
+    return alpha, best_move
+
+
+def negamax(game, cells, depth, ply, sign, alpha, beta, evaluate, deadline, counter):
+    """
+    Value of the position for the side to move (`sign` 1 for X, -1 for O),
+    searching `depth` more plies; the opponent's last move did not win.
+    """
+    counter[0] += 1
+    if counter[0] % 64 == 0 and time.perf_counter() > deadline:
+        raise SearchTimeout
+
+    moves = game.candidate_moves(cells)
+    if not moves:
+        return 0
+    if depth == 0:
+        return sign * evaluate(game, cells)
+
+    mark = X if sign == 1 else O
+    value = -math.inf
+    for move in moves:
+        cells[move] = mark
+        try:
+            if game.completes_window(cells, move):
+                score = WIN - ply
+            else:
+                score = -negamax(game, cells, depth - 1, ply + 1, -sign, -beta, -alpha,
+                                 evaluate, deadline, counter)
+        finally:
+            cells[move] = EMPTY
+        value = max(value, score)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+    return value
+
+
+def parallel_search(game, board, time_limit=1.0, evaluate=line_evaluator,
+                    max_depth=None, processes=None):
+    """
+    Same as `search`, but every iteration hands the root moves to a pool
+    of `processes` forked workers (all cores by default).
+
+    Workers share the best root value found so far and use it as their
+    alpha bound, so later root moves still get cut off by earlier ones.
+    `evaluate` must be a module-level function.
+    """
+    cells = flatten(board)
+    empty = cells.count(EMPTY)
+    if game.terminal(board):
+        return None, 0, 0
+    if max_depth is None or max_depth > empty:
+        max_depth = empty
+
+    sign = 1 if game.player(board) == X else -1
+    deadline = time.perf_counter() + time_limit
+    best_action, best_value, depth_reached = None, 0, 0
+    order = game.candidate_moves(cells)
+
+    context = multiprocessing.get_context("fork")
+    alpha = context.Value("d", -math.inf)
+    with context.Pool(processes or os.cpu_count(), _init_worker,
+                      (game, evaluate, alpha)) as pool:
+        for depth in range(1, max_depth + 1):
+            alpha.value = -math.inf
+            tasks = [(cells, move, depth, sign, deadline) for move in order]
+            values = {}
+            searched = 0
+            for move, value in pool.imap(_search_root_move, tasks):
+                if value is None:
+                    break
+                searched += 1
+                if value is not False:
+                    values[move] = value
+            if searched < len(order):
+                # Timed out: keep the previous iteration's answer
+                break
+
+            move = max(values, key=lambda cell: values[cell])
+            best_action = divmod(move, game.columns)
+            best_value, depth_reached = values[move], depth
+            order = [move] + [cell for cell in order if cell != move]
+            if abs(best_value) >= WIN - empty:
+                break
+
+    if best_action is None:
+        best_action = divmod(order[0], game.columns)
+    return best_action, best_value, depth_reached
+
+
+def _init_worker(game, evaluate, alpha):
+    global _worker_game, _worker_evaluate, _shared_alpha
+    _worker_game = game
+    _worker_evaluate = evaluate
+    _shared_alpha = alpha
+
+
+def _search_root_move(task):
+    """
+    Searches one root move in a worker, returning (move, value). The
+    value is None if the deadline passed, and False if the move could
+    not beat the shared alpha (another move is at least as good).
+    """
+    cells, move, depth, sign, deadline = task
+    if time.perf_counter() > deadline:
+        return move, None
+    alpha = _shared_alpha.value
+
+    cells[move] = X if sign == 1 else O
+    if _worker_game.completes_window(cells, move):
+        value = WIN
+    else:
+        try:
+            value = -negamax(_worker_game, cells, depth - 1, 1, -sign, -math.inf,
+                             -alpha, _worker_evaluate, deadline, [0])
+        except SearchTimeout:
+            return move, None
+
+    if value <= alpha:
+        return move, False
+    with _shared_alpha.get_lock():
+        if value > _shared_alpha.value:
+            _shared_alpha.value = value
+    return move, value
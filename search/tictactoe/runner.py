@@ -1,10 +1,14 @@
 import pygame
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import tictactoe as ttt
 
-pygame.init()
+# Only start the pygame modules the runner uses (not audio, joystick, ...)
+pygame.display.init()
+pygame.font.init()
 size = width, height = 600, 400
 
 # Colors
@@ -13,15 +17,45 @@ white = (255, 255, 255)
 
 screen = pygame.display.set_mode(size)
 
-mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
-largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+# Font sizes
+SMALL = 16
+MEDIUM = 28
+LARGE = 40
+MOVE = 60
+
+
+@lru_cache(maxsize=None)
+def font(size):
+    """
+    Loads the font at a size the first time it is drawn with.
+    """
+    return pygame.font.Font("OpenSans-Regular.ttf", size)
+
+
+# AI moves are computed on a background thread and polled every frame,
+# so the window keeps redrawing and handling events while the AI thinks
+ai_worker = ThreadPoolExecutor(max_workers=1)
+
+
+def think(board):
+    """
+    Runs minimax on the worker thread, returning (move, seconds taken).
+    """
+    start = time.perf_counter()
+    move = ttt.minimax(board)
+    return move, time.perf_counter() - start
+
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+ai_future = None
+think_time = None
+frame_time = 0
+clock = pygame.time.Clock()
 
 while True:
+    # Smoothed frame time in milliseconds
+    frame_time = 0.9 * frame_time + 0.1 * clock.tick(60)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -33,21 +67,21 @@ while True:
     if user is None:
 
         # Draw title
-        title = largeFont.render("Play Tic-Tac-Toe", True, white)
+        title = font(LARGE).render("Play Tic-Tac-Toe", True, white)
         titleRect = title.get_rect()
         titleRect.center = (int(width / 2), 50)
         screen.blit(title, titleRect)
 
         # Draw buttons
         playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
-        playX = mediumFont.render("Play as X", True, black)
+        playX = font(MEDIUM).render("Play as X", True, black)
         playXRect = playX.get_rect()
         playXRect.center = playXButton.center
         pygame.draw.rect(screen, white, playXButton)
         screen.blit(playX, playXRect)
 
         playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
-        playO = mediumFont.render("Play as O", True, black)
+        playO = font(MEDIUM).render("Play as O", True, black)
         playORect = playO.get_rect()
         playORect.center = playOButton.center
         pygame.draw.rect(screen, white, playOButton)
@@ -82,7 +116,7 @@ while True:
                 pygame.draw.rect(screen, white, rect, 3)
 
                 if board[i][j] != ttt.EMPTY:
-                    move = moveFont.render(board[i][j], True, white)
+                    move = font(MOVE).render(board[i][j], True, white)
                     moveRect = move.get_rect()
                     moveRect.center = rect.center
                     screen.blit(move, moveRect)
@@ -103,20 +137,19 @@ while True:
             title = f"Play as {user}"
         else:
             title = f"Computer thinking..."
-        title = largeFont.render(title, True, white)
+        title = font(LARGE).render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = (int(width / 2), 30)
         screen.blit(title, titleRect)
 
         # Check for AI move
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
+            if ai_future is None:
+                ai_future = ai_worker.submit(think, board)
+            elif ai_future.done():
+                move, think_time = ai_future.result()
                 board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+                ai_future = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -129,7 +162,7 @@ while True:
 
         if game_over:
             againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
+            again = font(MEDIUM).render("Play Again", True, black)
             againRect = again.get_rect()
             againRect.center = againButton.center
             pygame.draw.rect(screen, white, againButton)
@@ -141,6 +174,19 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    # Drop any pending AI move; a search already running
+                    # finishes on the worker but its result is ignored
+                    if ai_future is not None:
+                        ai_future.cancel()
+                    ai_future = None
+
+    # Show frame and AI think time
+    metrics = f"Frame: {frame_time:.1f} ms"
+    if think_time is not None:
+        metrics += f"   AI think: {think_time * 1000:.1f} ms"
+    metrics = font(SMALL).render(metrics, True, white)
+    metricsRect = metrics.get_rect()
+    metricsRect.bottomleft = (10, height - 5)
+    screen.blit(metrics, metricsRect)
 
     pygame.display.flip()
@@ -3,6 +3,7 @@ Tic Tac Toe Player
 """
 
 import math
+import os
 from copy import deepcopy, copy
 
 
@@ -132,47 +133,207 @@ def utility(board):
     
     raise NotImplementedError
 
-def max_value(board):
-        v = -math.inf
-        if terminal(board):
-            return utility(board)
+# Transposition table: canonical board key -> (value, bound flag).
+# A value is EXACT, or only a LOWER / UPPER bound when the search that
+# produced it was cut off by alpha-beta.
+EXACT, LOWER, UPPER = 0, 1, 2
+transposition_table = {}
+
+# Number of positions visited by max_value / min_value since the last reset
+nodes = 0
+
+def symmetries():
+    """
+    Returns the cell order (row-major indices) of each of the 8 rotations
+    and reflections of the board.
+    """
+    grid = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+    orders = []
+    for _ in range(4):
+        grid = [list(row) for row in zip(*grid[::-1])]  # rotate 90 degrees
+        orders.append(tuple(i for row in grid for i in row))
+        orders.append(tuple(i for row in grid for i in row[::-1]))
+    return orders
+
+
+SYMMETRIES = symmetries()
+
+# Center first, then corners, then edges: strong moves first means more cutoffs
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)]
+
+
+def canonical_key(board):
+    """
+    Returns a string key that is the same for all 8 rotations and
+    reflections of the board.
+    """
+    cells = "".join(position or "." for row in board for position in row)
+    return min("".join(cells[i] for i in symmetry) for symmetry in SYMMETRIES)
+
+
+def ordered_actions(board):
+    return [action for action in MOVE_ORDER if board[action[0]][action[1]] is EMPTY]
+
+
+def lookup(board, alpha, beta):
+    """
+    Probes the transposition table. Returns (value, alpha, beta), where
+    value is not None if the stored entry settles the position.
+    """
+    entry = transposition_table.get(canonical_key(board))
+    if entry is None:
+        return None, alpha, beta
+    value, flag = entry
+    if flag == EXACT:
+        return value, alpha, beta
+    if flag == LOWER:
+        alpha = max(alpha, value)
+    else:
+        beta = min(beta, value)
+    if alpha >= beta:
+        return value, alpha, beta
+    return None, alpha, beta
+
+
+def store(board, value, alpha, beta):
+    if value <= alpha:
+        flag = UPPER
+    elif value >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transposition_table[canonical_key(board)] = (value, flag)
+
+
+def max_value(board, alpha=-math.inf, beta=math.inf):
+    global nodes
+    nodes += 1
+    if terminal(board):
+        return utility(board)
+    value, alpha_in, beta_in = lookup(board, alpha, beta)
+    if value is not None:
+        return value
+    alpha, beta = alpha_in, beta_in
+
+    v = -math.inf
+    for action in ordered_actions(board):
+        v = max(v, min_value(result(board, action), alpha, beta))
+        alpha = max(alpha, v)
+        if alpha >= beta:
+            break
+    store(board, v, alpha_in, beta_in)
+    return v
+
+
+def min_value(board, alpha=-math.inf, beta=math.inf):
+    global nodes
+    nodes += 1
+    if terminal(board):
+        return utility(board)
+    value, alpha_in, beta_in = lookup(board, alpha, beta)
+    if value is not None:
+        return value
+    alpha, beta = alpha_in, beta_in
+
+    v = math.inf
+    for action in ordered_actions(board):
+        v = min(v, max_value(result(board, action), alpha, beta))
+        beta = min(beta, v)
+        if alpha >= beta:
+            break
+    store(board, v, alpha_in, beta_in)
+    return v
+
+
+# Perfect-play table written by book.py: one byte per base-3 position
+# index, holding (value + 1) << 4 | cell of the best move, or NOT_IN_BOOK
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+NOT_IN_BOOK = 0xFF
+NO_MOVE = 0x0F
+book = None
+
+
+def position_index(board):
+    """
+    Returns the base-3 index of a board (EMPTY 0, X 1, O 2, top-left
+    cell least significant).
+    """
+    index = 0
+    for position in reversed([position for row in board for position in row]):
+        index = index * 3 + (1 if position == X else 2 if position == O else 0)
+    return index
+
+
+def load_book(path=BOOK_PATH):
+    """
+    Loads the opening book into `book`, or sets it to an empty table if
+    the file does not exist.
+    """
+    global book
+    try:
+        with open(path, "rb") as f:
+            book = f.read()
+    except FileNotFoundError:
+        book = b""
+    return book
+
+
+def book_lookup(board):
+    """
+    Returns (action, value) for the board from the opening book, or
+    None if the book does not cover it.
+    """
+    if book is None:
+        load_book()
+    index = position_index(board)
+    if index >= len(book) or book[index] == NOT_IN_BOOK:
+        return None
+    entry = book[index]
+    cell = entry & 0x0F
+    action = None if cell == NO_MOVE else divmod(cell, 3)
+    return action, (entry >> 4) - 1
 
-        for action in actions(board):
-               v = max(v, min_value(result(board, action)))
-        return v
-    
-def min_value(board):
-        v = math.inf
-        if terminal(board):
-            return utility(board)
-        
-        for action in actions(board):
-            v = min(v, max_value(result(board, action)))
-        return v
 
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
+    if terminal(board):
+        return None
+    entry = book_lookup(board)
+    if entry is not None:
+        return entry[0]
+    return search(board)
+
+
+def search(board):
+    """
+    Returns the optimal action for the current player on the board by
+    alpha-beta search, without consulting the opening book.
+    """
+    if terminal(board):
+        return None
+
     best_action = None
     if player(board) == X:
         current_max_value = -math.inf
-        for action in actions(board):
-            min_result = min_value(result(board, action))
+        for action in ordered_actions(board):
+            # Only moves that beat the best so far need an exact value
+            min_result = min_value(result(board, action), current_max_value, math.inf)
             if min_result > current_max_value:
                 current_max_value = min_result
                 best_action = action
-    
+            if current_max_value == 1:
+                break
+
     else:
         current_min_value = math.inf
-        for action in actions(board):
-            max_result = max_value(result(board, action))
+        for action in ordered_actions(board):
+            max_result = max_value(result(board, action), -math.inf, current_min_value)
             if max_result < current_min_value:
                 current_min_value = max_result
                 best_action = action
-    
-    return best_action
-
+            if current_min_value == -1:
+                break
 
-    
-    raise NotImplementedError
+    return best_action
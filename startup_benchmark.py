@@ -0,0 +1,121 @@
+"""
+Cold-start benchmark for the game engines and pygame runners.
+
+Usage: python startup_benchmark.py [runs]
+
+Every measurement runs in a fresh interpreter and reports the median of
+`runs` runs (default 5) in milliseconds:
+  - importing each engine module, checking that it does not load pygame
+  - a bare interpreter and `import pygame`, for reference
+  - launching each runner until its first frame is drawn (with SDL's
+    dummy video driver, so no display is needed)
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+ENGINES = [
+    ("search/tictactoe", "tictactoe"),
+    ("search/tictactoe", "bitboard"),
+    ("search/tictactoe", "mnk"),
+    ("knowledge/minesweeper", "minesweeper"),
+]
+
+RUNNERS = ["search/tictactoe", "knowledge/minesweeper"]
+
+IMPORT_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{
+    "ms": (time.perf_counter() - start) * 1000,
+    "pygame_loaded": "pygame" in sys.modules,
+}}))
+"""
+
+# Replaces pygame.display.flip so the runner exits after its first frame
+FIRST_FRAME_CODE = """
+import os, runpy, sys
+import pygame
+flip = pygame.display.flip
+def first_flip():
+    flip()
+    print("frame", flush=True)
+    os._exit(0)
+pygame.display.flip = first_flip
+sys.path.insert(0, ".")
+sys.argv = ["runner.py"]
+runpy.run_path("runner.py", run_name="__main__")
+"""
+
+
+def run(code, directory=ROOT, env=None):
+    """
+    Runs `code` in a fresh interpreter, returning (wall ms, stdout).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=os.path.join(ROOT, directory),
+        env=env, capture_output=True, text=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000, completed.stdout
+
+
+def median(values):
+    return round(statistics.median(values), 2)
+
+
+def pygame_available():
+    try:
+        run("import pygame")
+    except subprocess.CalledProcessError:
+        return False
+    return True
+
+
+def benchmark(runs=5):
+    report = {"runs": runs, "engines": {}, "runners": {}}
+
+    for directory, module in ENGINES:
+        results = [json.loads(run(IMPORT_CODE.format(module=module), directory)[1])
+                   for _ in range(runs)]
+        report["engines"][module] = {
+            "import_ms": median(result["ms"] for result in results),
+            "pygame_loaded": any(result["pygame_loaded"] for result in results),
+        }
+
+    report["interpreter_ms"] = median(run("pass")[0] for _ in range(runs))
+    if not pygame_available():
+        report["runners"] = "skipped: pygame is not installed"
+        return report
+    report["import_pygame_ms"] = median(run("import pygame")[0] for _ in range(runs))
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    for directory in RUNNERS:
+        report["runners"][directory] = {
+            "first_frame_ms": median(
+                run(FIRST_FRAME_CODE, directory, env)[0] for _ in range(runs)
+            )
+        }
+    return report
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python startup_benchmark.py [runs]")
+    runs = int(sys.argv[1]) if len(sys.argv) == 2 else 5
+    report = benchmark(runs)
+    print(json.dumps(report, indent=2))
+    if any(engine["pygame_loaded"] for engine in report["engines"].values()):
+        sys.exit("An engine module imported pygame.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Parallel crawler building a LinkGraph straight from a directory of HTML.
+
+Each file is scanned with a bytes regex (large files through a memory
+map instead of a copy), and its links are interned to page indices
+right away, so no per-page sets of names are built. With several
+workers the files are split over a pool of forked processes that
+inherit the page index.
+"""
+
+import mmap
+import multiprocessing
+import os
+import re
+import sys
+import time
+from array import array
+
+from graph import LinkGraph
+
+LINK = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
+# Files at least this large are memory-mapped rather than read
+MMAP_THRESHOLD = 1 << 20
+
+# Page name -> index, set in worker processes by _init_worker
+_index = None
+
+
+def html_files(directory, limit=None):
+    """
+    Returns the sorted .html filenames of a directory, at most `limit`.
+    """
+    filenames = sorted(
+        filename for filename in os.listdir(directory)
+        if filename.endswith(".html")
+    )
+    return filenames if limit is None else filenames[:limit]
+
+
+def extract_links(path, index, own_index):
+    """
+    Returns the sorted, distinct indices of corpus pages linked to by the
+    file at `path`, leaving out the page itself.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return array("q")
+        if size < MMAP_THRESHOLD:
+            targets = _link_targets(f.read(), index, own_index)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                targets = _link_targets(contents, index, own_index)
+    return array("q", sorted(targets))
+
+
+def _link_targets(contents, index, own_index):
+    targets = set()
+    for link in LINK.findall(contents):
+        target = index.get(link.decode("utf-8", "replace"))
+        if target is not None and target != own_index:
+            targets.add(target)
+    return targets
+
+
+def _init_worker(index):
+    global _index
+    _index = index
+
+
+def _extract_in_worker(task):
+    path, own_index = task
+    return extract_links(path, _index, own_index).tobytes()
+
+
+def crawl_graph(directory, limit=None, workers=None, report=False):
+    """
+    Crawls up to `limit` HTML files of `directory` into a LinkGraph.
+
+    With `workers` > 1 the files are scanned in that many processes.
+    With `report`, the crawl rate in files per second is printed to
+    stderr when done.
+    """
+    start = time.perf_counter()
+    names = html_files(directory, limit)
+    index = {name: i for i, name in enumerate(names)}
+    tasks = [(os.path.join(directory, name), i) for i, name in enumerate(names)]
+
+    indptr = array("q", [0])
+    indices = array("q")
+    if not workers or workers == 1:
+        for path, own_index in tasks:
+            indices.extend(extract_links(path, index, own_index))
+            indptr.append(len(indices))
+    else:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers, _init_worker, (index,)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 16))
+            for links in pool.imap(_extract_in_worker, tasks, chunksize):
+                indices.frombytes(links)
+                indptr.append(len(indices))
+
+    if report:
+        seconds = time.perf_counter() - start
+        rate = len(names) / seconds if seconds else float("inf")
+        print(f"Crawled {len(names)} files, {len(indices)} links "
+              f"in {seconds:.2f}s ({rate:.0f} files/s)", file=sys.stderr)
+    return LinkGraph(names, indptr, indices)
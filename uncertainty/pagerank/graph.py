@@ -0,0 +1,220 @@
+from collections import deque
+
+import numpy as np
+
+
+class LinkGraph():
+    """
+    Link structure of a corpus with pages interned to integer indices.
+
+    Links are stored twice in CSR form: `out_indptr` / `out_indices` give
+    the pages each page links to, and `in_indptr` / `in_sources` give the
+    pages linking to each page, which is what a PageRank step reads.
+    """
+
+    def __init__(self, names, out_indptr, out_indices, in_indptr=None,
+                 in_sources=None, in_weights=None):
+        """
+        The incoming-link arrays are derived from the outgoing ones unless
+        given (as when loading a stored graph, see store.py).
+        """
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.out_indptr = np.asarray(out_indptr, dtype=np.int64)
+        self.out_indices = np.asarray(out_indices, dtype=np.int64)
+
+        n = len(self.names)
+        self.out_degree = np.diff(self.out_indptr)
+        self.dangling = np.flatnonzero(self.out_degree == 0)
+
+        if in_indptr is None:
+            # Transpose to incoming-link CSR, sorted by destination page
+            sources = np.repeat(np.arange(n, dtype=np.int64), self.out_degree)
+            order = np.argsort(self.out_indices, kind="stable")
+            in_sources = sources[order]
+            in_indptr = np.concatenate(
+                ([0], np.cumsum(np.bincount(self.out_indices, minlength=n)))
+            )
+        self.in_sources = np.asarray(in_sources, dtype=np.int64)
+        self.in_indptr = np.asarray(in_indptr, dtype=np.int64)
+        if in_weights is None:
+            in_weights = 1.0 / self.out_degree[self.in_sources]
+        self.in_weights = np.asarray(in_weights, dtype=np.float64)
+        self.has_in_links = np.diff(self.in_indptr) > 0
+        self.in_starts = self.in_indptr[:-1][self.has_in_links]
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """
+        Builds a graph from a `crawl`-style dict of page -> linked pages.
+        Links to pages outside the corpus and self-links are dropped.
+        """
+        names = sorted(corpus)
+        index = {name: i for i, name in enumerate(names)}
+        indptr = [0]
+        indices = []
+        for name in names:
+            targets = sorted(
+                index[link] for link in set(corpus[name])
+                if link in index and link != name
+            )
+            indices.extend(targets)
+            indptr.append(len(indices))
+        return cls(names, indptr, indices)
+
+    def propagate(self, ranks):
+        """
+        Returns where one random-surfer step moves the rank vector when
+        following links: each page splits its rank over its out-links, and
+        dangling pages spread theirs over every page, as a rank-one
+        correction.
+        """
+        return self.follow_links(ranks) + ranks[self.dangling].sum() / len(self)
+
+    def follow_links(self, ranks):
+        """
+        Like `propagate`, but the rank of dangling pages is dropped
+        instead of spread, for callers that redistribute it themselves.
+        """
+        result = np.zeros(len(self))
+        if len(self.in_sources):
+            result[self.has_in_links] = np.add.reduceat(
+                ranks[self.in_sources] * self.in_weights, self.in_starts
+            )
+        return result
+
+    def to_dict(self, ranks):
+        return {name: float(rank) for name, rank in zip(self.names, ranks)}
+
+
+def power_iteration(graph, damping_factor, tolerance=1e-6, max_iterations=1000):
+    """
+    Iterates the PageRank equation from the uniform distribution until
+    the L1 norm of the change drops below `tolerance`.
+
+    Returns the rank vector and the number of iterations run.
+    """
+    n = len(graph)
+    ranks = np.full(n, 1 / n)
+    teleport = (1 - damping_factor) / n
+    for iteration in range(1, max_iterations + 1):
+        new_ranks = teleport + damping_factor * graph.propagate(ranks)
+        change = np.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if change < tolerance:
+            break
+    return ranks / ranks.sum(), iteration
+
+
+def personalized_power_iteration(graph, teleports, damping_factor, tolerance=1e-6,
+                                 max_iterations=1000):
+    """
+    Personalized PageRank for a batch of teleport distributions at once.
+
+    `teleports` is an N x B matrix whose columns are probability
+    distributions over pages; the surfer teleports (and leaves dangling
+    pages) according to its column instead of uniformly. The rank vectors
+    share one graph and one loop, but each sparse step is taken one
+    vector at a time: a 2-D NumPy gather costs at least as much per
+    column as a 1-D one. A vector stops being iterated once its L1 change
+    drops below `tolerance`.
+
+    Returns the N x B rank matrix and the number of iterations run.
+    """
+    # One contiguous row per rank vector, so every sparse step gathers
+    # from a flat array
+    teleports = np.array(np.asarray(teleports, dtype=np.float64).T, order="C")
+    ranks = teleports.copy()
+    active = list(range(len(ranks)))
+    for iteration in range(1, max_iterations + 1):
+        still_active = []
+        for row in active:
+            vector = ranks[row]
+            dangling_mass = vector[graph.dangling].sum()
+            new_vector = damping_factor * graph.follow_links(vector)
+            new_vector += (1 - damping_factor + damping_factor * dangling_mass) * teleports[row]
+            if np.abs(new_vector - vector).sum() >= tolerance:
+                still_active.append(row)
+            ranks[row] = new_vector
+        # Converged vectors drop out of the batch
+        active = still_active
+        if not active:
+            break
+    return (ranks / ranks.sum(axis=1, keepdims=True)).T, iteration
+
+
+def local_push(graph, seed, damping_factor, epsilon=1e-4):
+    """
+    Approximate personalized PageRank for teleporting to the single page
+    `seed` (an index), by pushing residual probability outwards from the
+    seed only while it is above `epsilon` per out-link.
+
+    Only pages near the seed are ever touched. Returns a dict of page
+    index -> rank for the pages that received rank; each value falls
+    short of the exact one by less than the residual left unpushed.
+    """
+    ranks = {}
+    residual = {seed: 1.0}
+    queue = deque([seed])
+    while queue:
+        page = queue.popleft()
+        amount = residual[page]
+        degree = int(graph.out_degree[page])
+        if amount < epsilon * max(degree, 1):
+            continue
+        residual[page] = 0.0
+        ranks[page] = ranks.get(page, 0.0) + (1 - damping_factor) * amount
+
+        if degree:
+            start = graph.out_indptr[page]
+            targets = graph.out_indices[start:start + degree].tolist()
+            share = damping_factor * amount / degree
+        else:
+            # A dangling page teleports, which means back to the seed
+            targets = [seed]
+            share = damping_factor * amount
+        for target in targets:
+            before = residual.get(target, 0.0)
+            residual[target] = before + share
+            threshold = epsilon * max(int(graph.out_degree[target]), 1)
+            if before < threshold <= before + share:
+                queue.append(target)
+    return ranks
+
+
+def random_surfer_counts(graph, damping_factor, n, rng, min_chain_length=100,
+                         max_chains=1 << 16):
+    """
+    Simulates `n` random-surfer steps and returns how often each page
+    was visited.
+
+    The steps are spread over many independent chains that advance
+    together, one vectorized step at a time; each chain is at least
+    `min_chain_length` steps long so it forgets its random start. All
+    out-links of a page are equally likely, so picking one is a single
+    uniform draw into the page's slice of the CSR arrays.
+    """
+    pages = len(graph)
+    chains = max(1, min(max_chains, n // min_chain_length))
+    state = rng.integers(0, pages, chains)
+    counts = np.zeros(pages, dtype=np.int64)
+
+    remaining = n
+    while remaining > 0:
+        degree = graph.out_degree[state]
+        teleport = (rng.random(chains) >= damping_factor) | (degree == 0)
+        link = graph.out_indptr[state] + (rng.random(chains) * degree).astype(np.int64)
+        if len(graph.out_indices):
+            # Teleporting chains read a clamped dummy link, replaced below
+            followed = graph.out_indices[np.minimum(link, len(graph.out_indices) - 1)]
+        else:
+            followed = state
+        state = np.where(teleport, rng.integers(0, pages, chains), followed)
+
+        counted = state if remaining >= chains else state[:remaining]
+        counts += np.bincount(counted, minlength=pages)
+        remaining -= len(counted)
+    return counts
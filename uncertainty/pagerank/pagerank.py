@@ -1,8 +1,14 @@
-import os
-import random
-import re
 import sys
 
+import numpy as np
+
+from crawler import crawl_graph
+from graph import (
+    LinkGraph, local_push, personalized_power_iteration, power_iteration,
+    random_surfer_counts,
+)
+from store import load_graph
+
 DAMPING = 0.85
 SAMPLES = 100000
 
@@ -10,7 +16,7 @@ SAMPLES = 100000
 def main():
     if len(sys.argv) != 2:
         sys.exit("Usage: python pagerank.py corpus")
-    corpus = crawl(sys.argv[1])
+    corpus = load_graph(sys.argv[1])
     ranks = sample_pagerank(corpus, DAMPING, SAMPLES)
     print(f"PageRank Results from Sampling (n = {SAMPLES})")
     for page in sorted(ranks):
@@ -21,31 +27,32 @@ def main():
         print(f"  {page}: {ranks[page]:.4f}")
 
 
-def crawl(directory):
+def as_link_graph(corpus):
     """
-    Parse a directory of HTML pages and check for links to other pages.
-    Return a dictionary where each key is a page, and values are
-    a list of all other pages in the corpus that are linked to by the page.
+    Returns `corpus` as a LinkGraph: either it already is one (as loaded
+    by store.load_graph) or it is a `crawl`-style dictionary.
     """
-    pages = dict()
+    if isinstance(corpus, LinkGraph):
+        return corpus
+    return LinkGraph.from_corpus(corpus)
 
-    # Extract all links from HTML files
-    for filename in os.listdir(directory):
-        if not filename.endswith(".html"):
-            continue
-        with open(os.path.join(directory, filename)) as f:
-            contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
 
-    # Only include links to other pages in the corpus
-    for filename in pages:
-        pages[filename] = set(
-            link for link in pages[filename]
-            if link in pages
-        )
+def crawl(directory, limit=None, workers=None):
+    """
+    Parse a directory of HTML pages and check for links to other pages.
+    Return a dictionary where each key is a page, and values are
+    a list of all other pages in the corpus that are linked to by the page.
 
-    return pages
+    Only the first `limit` pages (in name order) are read if given, and
+    `workers` processes scan the files in parallel (see crawler.py).
+    """
+    link_graph = crawl_graph(directory, limit, workers)
+    names = link_graph.names
+    indptr = link_graph.out_indptr
+    return {
+        name: set(names[j] for j in link_graph.out_indices[indptr[i]:indptr[i + 1]])
+        for i, name in enumerate(names)
+    }
 
 
 def transition_model(corpus, page, damping_factor):
@@ -73,7 +80,7 @@ def transition_model(corpus, page, damping_factor):
     return return_dict
 
 
-def sample_pagerank(corpus, damping_factor, n):
+def sample_pagerank(corpus, damping_factor, n, seed=None):
     """
     Return PageRank values for each page by sampling `n` pages
     according to transition model, starting with a page at random.
@@ -81,23 +88,16 @@ def sample_pagerank(corpus, damping_factor, n):
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
+
+    The walk is generated in vectorized batches over many independent
+    chains (see graph.py); `seed` makes it reproducible. `corpus` may
+    also be a LinkGraph, such as one loaded from a store (see store.py).
     """
-    starting_page = random.choice(list(corpus.keys()))
-    return_dict = {site: float(0) for site in corpus}
-    probs = transition_model(corpus, starting_page, damping_factor)
-    
-    for i in range(SAMPLES):
-        keys_list = list(probs.keys())
-        weights_list = list(probs.values())
-        random_page = random.choices(keys_list, weights= weights_list, k=1)[0]
-        return_dict[random_page] += 1
-        probs = transition_model(corpus, random_page, damping_factor)
-    for key in return_dict:
-        return_dict[key] /=  SAMPLES
-    
-    print(sum(return_dict.values()))
-    return return_dict        
-    #raise NotImplementedError
+    link_graph = as_link_graph(corpus)
+    counts = random_surfer_counts(
+        link_graph, damping_factor, n, np.random.default_rng(seed)
+    )
+    return link_graph.to_dict(counts / n)
 
 
 def iterate_pagerank(corpus, damping_factor):
@@ -108,38 +108,49 @@ def iterate_pagerank(corpus, damping_factor):
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
+
+    The corpus is turned into a sparse link graph once (or is one
+    already, see store.py), and each step is a vectorized sparse
+    matrix-vector product (see graph.py).
     """
-    num_pages_in_corpus = len(corpus)
-    return_dict = {page: float(1 / num_pages_in_corpus) for page in corpus}
-    link_dict = {page: set() for page in corpus.keys()} #key: page, value: set of pages that link to the key-page
-    for page in corpus:
-        for other_page in corpus:
-            if page in corpus[other_page]:
-                link_dict[page].add(other_page)
-
-    keep_iterating = True
-    while keep_iterating:
-        old_dict = return_dict.copy()
-        for page in corpus:
-            #pages_that_link_to_page = [p for p in corpus if page in corpus[p]]
-            pages_that_link_to_page = link_dict[page]
-            sum_in_formula = 0
-            for p in pages_that_link_to_page:
-                if corpus[p]:
-                    sum_in_formula += (return_dict[p] / len(corpus[p]))
-                else:
-                    sum_in_formula += return_dict[p] / num_pages_in_corpus
-            return_dict[page] = ((1 - damping_factor) / num_pages_in_corpus) + damping_factor * sum_in_formula
-        for page in old_dict:
-            keep_iterating = False
-            if abs(old_dict[page] - return_dict[page]) > 0.001:
-                keep_iterating = True
-                break
-    total = sum(return_dict.values()) 
-    return_dict = {k: v / total for k, v in return_dict.items()}
-    print(sum(return_dict.values()))
-    return return_dict
-   # raise NotImplementedError
+    link_graph = as_link_graph(corpus)
+    ranks, _ = power_iteration(link_graph, damping_factor)
+    return link_graph.to_dict(ranks)
+
+
+def personalized_pagerank(corpus, damping_factor, seeds):
+    """
+    Return personalized PageRank values for each seed in `seeds`.
+
+    Each seed is a page, a set of pages (teleported to uniformly) or a
+    dictionary of page -> teleport weight. Return a list with one
+    dictionary of page -> PageRank value per seed, in order. All seeds
+    are solved together against the same link graph.
+    """
+    link_graph = as_link_graph(corpus)
+    teleports = np.zeros((len(link_graph), len(seeds)))
+    for column, seed in enumerate(seeds):
+        if isinstance(seed, str):
+            seed = {seed}
+        if not isinstance(seed, dict):
+            seed = dict.fromkeys(seed, 1.0)
+        for page, weight in seed.items():
+            teleports[link_graph.index[page], column] = weight
+        teleports[:, column] /= teleports[:, column].sum()
+
+    ranks, _ = personalized_power_iteration(link_graph, teleports, damping_factor)
+    return [link_graph.to_dict(ranks[:, column]) for column in range(len(seeds))]
+
+
+def approximate_personalized_pagerank(corpus, damping_factor, seed, epsilon=1e-4):
+    """
+    Return approximate personalized PageRank values for teleporting to
+    the single page `seed`, computed by local pushes from the seed (see
+    graph.py). Pages the pushes never reached are left out.
+    """
+    link_graph = as_link_graph(corpus)
+    ranks = local_push(link_graph, link_graph.index[seed], damping_factor, epsilon)
+    return {link_graph.names[page]: rank for page, rank in ranks.items()}
 
 
 if __name__ == "__main__":
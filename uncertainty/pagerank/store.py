@@ -0,0 +1,198 @@
+"""
+Persistent on-disk store of a corpus link graph.
+
+`python store.py corpus` crawls the corpus once and writes
+`corpus/pagerank.snapshot`. Later runs of pagerank.py map that file
+instead of parsing the HTML, as long as no page has changed since the
+store was written.
+
+Layout: a fixed header (magic, version, JSON metadata length), the JSON
+metadata (a digest of the source pages and the section sizes), then
+8-byte aligned sections: the out-link and in-link CSR int64 arrays, the
+float64 link weights, and a string table of page names. The header,
+padding and atomic write follow search/degrees/snapshot.py on purpose;
+keep the two formats in step.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from crawler import crawl_graph, html_files
+from graph import LinkGraph
+
+MAGIC = b"PRGRAPH\0"
+VERSION = 2
+FILENAME = "pagerank.snapshot"
+
+HEADER = struct.Struct("<8sII")
+ARRAYS = (
+    ("out_indptr", np.int64),
+    ("out_indices", np.int64),
+    ("in_indptr", np.int64),
+    ("in_sources", np.int64),
+    ("in_weights", np.float64),
+)
+
+
+def store_path(directory):
+    return os.path.join(directory, FILENAME)
+
+
+def source_signature(directory):
+    """
+    Returns the number of HTML pages and a digest of their names, sizes
+    and modification times, used to detect when a store has gone stale.
+    Its size does not grow with the corpus.
+    """
+    digest = hashlib.sha256()
+    filenames = html_files(directory)
+    for filename in filenames:
+        stat = os.stat(os.path.join(directory, filename))
+        entry = f"{filename}\0{stat.st_size}\0{stat.st_mtime_ns}\n"
+        digest.update(entry.encode("utf-8"))
+    return [len(filenames), digest.hexdigest()]
+
+
+def write_store(directory, graph):
+    """
+    Writes `graph` (a LinkGraph, or a `crawl`-style dict of page ->
+    linked pages) to a store file in `directory`.
+    """
+    if not isinstance(graph, LinkGraph):
+        graph = LinkGraph.from_corpus(graph)
+
+    sections = [
+        np.ascontiguousarray(getattr(graph, name), dtype=dtype).tobytes()
+        for name, dtype in ARRAYS
+    ]
+    sections.append("\0".join(graph.names).encode("utf-8"))
+
+    metadata = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": source_signature(directory),
+        "num_pages": len(graph),
+        "sections": [len(section) for section in sections],
+    }).encode("utf-8")
+
+    # Write to a temporary file first so readers never see a partial file
+    path = store_path(directory)
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(metadata)))
+        f.write(metadata)
+        f.write(b"\0" * _padding(f.tell()))
+        for section in sections:
+            f.write(section)
+            f.write(b"\0" * _padding(f.tell()))
+    os.replace(path + ".tmp", path)
+
+
+def read_metadata(f):
+    """
+    Returns the header metadata of an open store file, or None if it is
+    not a store of the current version.
+    """
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    magic, version, length = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def fresh_metadata(directory):
+    """
+    Returns the metadata of the store in `directory` if it matches the
+    current HTML pages, and None otherwise.
+    """
+    try:
+        with open(store_path(directory), "rb") as f:
+            metadata = read_metadata(f)
+        if (
+            metadata is not None
+            and metadata["byteorder"] == sys.byteorder
+            and metadata["sources"] == source_signature(directory)
+        ):
+            return metadata
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def is_fresh(directory):
+    """
+    Returns True if `directory` holds a store that matches its current
+    HTML pages.
+    """
+    return fresh_metadata(directory) is not None
+
+
+def load_store(directory, metadata=None):
+    """
+    Maps the store in `directory` into memory and returns its LinkGraph.
+    `metadata` may be passed in if the header was already read, as by
+    `fresh_metadata`.
+
+    The link arrays are read-only views on the mapped file, so nothing
+    is parsed or copied and their pages are shared between processes
+    that load the same store.
+    """
+    with open(store_path(directory), "rb") as f:
+        if metadata is None:
+            metadata = read_metadata(f)
+            if metadata is None:
+                raise ValueError("not a pagerank graph store")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    _, _, length = HEADER.unpack_from(buffer)
+    offset = HEADER.size + length
+    offset += _padding(offset)
+    arrays = []
+    for (name, dtype), size in zip(ARRAYS, metadata["sections"]):
+        arrays.append(np.frombuffer(
+            buffer, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset
+        ))
+        offset += size + _padding(offset + size)
+
+    size = metadata["sections"][-1]
+    names = buffer[offset:offset + size].decode("utf-8").split("\0")
+    if not metadata["num_pages"]:
+        names = []
+    return LinkGraph(names, *arrays)
+
+
+def load_graph(directory, workers=None):
+    """
+    Returns the LinkGraph of `directory`, from its store if that is
+    fresh and by crawling the HTML otherwise.
+    """
+    metadata = fresh_metadata(directory)
+    if metadata is not None:
+        return load_store(directory, metadata)
+    return crawl_graph(directory, workers=workers)
+
+
+def _padding(offset):
+    return -offset % 8
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python store.py corpus")
+    directory = sys.argv[1]
+
+    print("Crawling...")
+    graph = crawl_graph(directory)
+    print("Writing store...")
+    write_store(directory, graph)
+    print(f"Store written to {store_path(directory)}.")
+
+
+if __name__ == "__main__":
+    main()